@@ -0,0 +1,24 @@
+// Troca de abas dos popups do mapa, incluída uma única vez por mapa.
+// O listener fica no documento (fase de captura) porque o conteúdo dos popups é criado sob demanda pelo Leaflet.
+document.addEventListener("click", function (event) {
+    var botao = event.target.closest('[data-bs-toggle="tab"]');
+    if (!botao) {
+        return;
+    }
+    var popup = botao.closest(".leaflet-popup-content") || document;
+
+    popup.querySelectorAll('[data-bs-toggle="tab"]').forEach(function (aba) {
+        aba.classList.remove("active");
+        aba.setAttribute("aria-selected", "false");
+    });
+    popup.querySelectorAll(".tab-pane").forEach(function (painel) {
+        painel.classList.remove("show", "active");
+    });
+
+    botao.classList.add("active");
+    botao.setAttribute("aria-selected", "true");
+    var alvo = popup.querySelector(botao.getAttribute("data-bs-target"));
+    if (alvo) {
+        alvo.classList.add("show", "active");
+    }
+}, true);
@@ -0,0 +1,64 @@
+import argparse
+import sys
+import numpy as np
+import pandas as pd
+from benchmarks.datasets import generate_sire_data
+from utils.cube import build_indicator_cube, consolidar_microrregioes, update_indicator_cube
+from utils.ingest import prepare_indicator_rows
+from utils.microrregioes import MICRORREGIOES, OPERACOES
+
+def incremental_cube_differences(data, partes):
+    """
+    Compara o cubo atualizado lote a lote com `update_indicator_cube` com o cubo calculado de uma vez sobre os
+    mesmos dados. Os lotes são grupos de municípios, de forma que as linhas de cada lote caem em células de
+    microrregião e de estado que já existem no cubo.
+
+    Args:
+        data (pd.DataFrame): Dados no esquema de `utils.schema.INDICATOR_SCHEMA`.
+        partes (int): Número de lotes.
+
+    Returns:
+        list: Descrição das diferenças encontradas (vazia se os dois caminhos coincidem).
+    """
+    ibges = np.array_split(np.asarray(data["IBGE"].astype(str).unique()), partes)
+    lotes = [data[data["IBGE"].astype(str).isin(lote)] for lote in ibges]
+    incremental = build_indicator_cube(lotes[0])
+    for lote in lotes[1:]:
+        incremental = update_indicator_cube(incremental, lote)
+    completo = build_indicator_cube(data)
+
+    diferencas = []
+    if not incremental.index.equals(completo.index):
+        diferencas.append("células do cubo diferentes")
+        return diferencas
+    for estatistica in ("count", "min", "max"):
+        if not incremental[estatistica].equals(completo[estatistica]):
+            diferencas.append(f"estatística '{estatistica}' diferente")
+
+    # Os valores exibidos (arredondados) devem ser idênticos
+    for is_anual in (True, False):
+        esperado = consolidar_microrregioes(completo, MICRORREGIOES, OPERACOES, is_anual)
+        obtido = consolidar_microrregioes(incremental, MICRORREGIOES, OPERACOES, is_anual)
+        divergentes = (esperado["Valor"] != obtido["Valor"]).sum()
+        if divergentes:
+            diferencas.append(f"{divergentes} valores {'anuais' if is_anual else 'mensais'} de microrregião diferentes")
+    return diferencas
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Verifica que a atualização incremental do cubo de agregados coincide com o cálculo completo."
+    )
+    parser.add_argument("--anos", type=int, nargs=2, metavar=("INICIAL", "FINAL"), default=(2020, 2024))
+    parser.add_argument("--partes", type=int, default=10, help="Lotes de municípios acrescentados")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3])
+    args = parser.parse_args()
+
+    falhas = 0
+    for seed in args.seeds:
+        data = prepare_indicator_rows(
+            generate_sire_data(anos=range(args.anos[0], args.anos[1] + 1), primeiro_ano_mensal=args.anos[0], seed=seed)
+        )
+        diferencas = incremental_cube_differences(data, args.partes)
+        falhas += bool(diferencas)
+        print(f"seed {seed}: {len(data)} linhas, " + ("; ".join(diferencas) if diferencas else "idênticos"))
+    sys.exit(1 if falhas else 0)
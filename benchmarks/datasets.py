@@ -0,0 +1,139 @@
+import argparse
+import numpy as np
+import pandas as pd
+from utils.dashboard import GEOJSON_PATH, GLOSSARIO_PATH, MUNICIPIOS_OBRIGATORIOS_FILTRO
+from utils.geometry import read_geometrias
+from utils.ingest import COLUNAS_CSV
+
+# Linhas do CSV atual, usadas como unidade das escalas do conjunto sintético
+LINHAS_CSV_ATUAL = 664
+
+# Último ano gerado por padrão, igual ao último ano do dashboard
+ULTIMO_ANO = 2024
+
+def generate_sire_data(n_municipios=None, n_siglas=None, anos=(2023, 2024), primeiro_ano_mensal=None,
+                       taxa_lacunas=0.05, taxa_ausencia=0.02, seed=42):
+    """
+    Gera linhas sintéticas no formato do CSV de indicadores do SIRE (`Sigla,Valor,Unidade,Mês,Ano,Cidade,IBGE`).
+
+    Os municípios (IBGE e nome) vêm do GeoJSON, começando pelos municípios do recorte do dashboard, e os indicadores
+    e unidades vêm do glossário. Cada município tem um nível próprio por indicador, com variação mensal; o consolidado
+    anual (linha sem mês) é a média dos meses gerados no ano.
+
+    Args:
+        n_municipios (int, optional): Número de municípios; todos os do GeoJSON se None.
+        n_siglas (int, optional): Número de indicadores; todos os do glossário se None.
+        anos (iterable): Anos gerados.
+        primeiro_ano_mensal (int, optional): A partir deste ano há linhas mensais; antes dele, apenas o consolidado
+            anual (como em 2023 no CSV atual). Se None, o segundo ano gerado (ou o único).
+        taxa_lacunas (float): Fração das linhas mensais removidas (meses não informados).
+        taxa_ausencia (float): Fração dos pares município × indicador sem nenhuma linha.
+        seed (int): Semente do gerador aleatório.
+
+    Returns:
+        pd.DataFrame: Linhas no formato do CSV de indicadores.
+    """
+    rng = np.random.default_rng(seed)
+    anos = list(anos)
+    if primeiro_ano_mensal is None:
+        primeiro_ano_mensal = anos[1] if len(anos) > 1 else anos[0]
+
+    # Municípios do GeoJSON, com os do recorte do dashboard primeiro
+    municipios = read_geometrias(GEOJSON_PATH)[["id", "name"]].astype(str)
+    municipios = municipios.assign(prioridade=~municipios["id"].isin(MUNICIPIOS_OBRIGATORIOS_FILTRO))
+    municipios = municipios.sort_values("prioridade", kind="stable").head(n_municipios)
+    glossario = pd.read_csv(GLOSSARIO_PATH, sep=',')[["Sigla", "Unidade"]].sort_values("Sigla").head(n_siglas)
+
+    # Pares município × indicador, com um nível médio e uma variação próprios
+    pares = municipios.merge(glossario, how="cross")
+    pares = pares[rng.random(len(pares)) >= taxa_ausencia].reset_index(drop=True)
+    percentual = (pares["Unidade"] == "percentual").to_numpy()
+    nivel = np.where(percentual, rng.uniform(40, 100, len(pares)), rng.uniform(1, 50, len(pares)))
+    variacao = nivel * rng.uniform(0.01, 0.08, len(pares))
+
+    # Uma linha por par, ano e mês (0 = consolidado anual)
+    periodos = pd.DataFrame(
+        [(ano, mes) for ano in anos for mes in ([0] + list(range(1, 13)) if ano >= primeiro_ano_mensal else [0])],
+        columns=["Ano", "Mês"],
+    )
+    linhas = pd.DataFrame({"par": np.arange(len(pares))}).merge(periodos, how="cross")
+    par = linhas["par"].to_numpy()
+    mensal = linhas["Mês"].to_numpy() > 0
+
+    valores = nivel[par] + rng.normal(0, 1, len(linhas)) * variacao[par]
+    valores = np.where(percentual[par], np.clip(valores, 0, 100), np.maximum(valores, 0))
+    linhas["Valor"] = valores.round(2)
+
+    # Meses não informados
+    linhas = linhas[~mensal | (rng.random(len(linhas)) >= taxa_lacunas)]
+
+    # O consolidado anual dos anos com dados mensais é a média dos meses informados
+    medias = linhas[linhas["Mês"] > 0].groupby(["par", "Ano"])["Valor"].mean().round(2)
+    anuais = linhas["Mês"] == 0
+    chaves_anuais = pd.MultiIndex.from_frame(linhas.loc[anuais, ["par", "Ano"]])
+    linhas.loc[anuais, "Valor"] = medias.reindex(chaves_anuais).fillna(linhas.loc[anuais, "Valor"]).to_numpy()
+
+    par = linhas["par"].to_numpy()
+    return pd.DataFrame({
+        "Sigla": pares["Sigla"].to_numpy()[par],
+        "Valor": linhas["Valor"].to_numpy(),
+        "Unidade": pares["Unidade"].to_numpy()[par],
+        "Mês": linhas["Mês"].replace(0, np.nan).astype("Int64").to_numpy(),
+        "Ano": linhas["Ano"].to_numpy(),
+        "Cidade": pares["name"].str.upper().to_numpy()[par],
+        "IBGE": pares["id"].to_numpy()[par],
+    })[COLUNAS_CSV]
+
+def scaled_dataset(fator, seed=42):
+    """
+    Gera um conjunto sintético com aproximadamente `fator` vezes as linhas do CSV atual, crescendo primeiro em
+    municípios (até todos os do GeoJSON), depois em indicadores (até todos os do glossário) e por fim em anos
+    anteriores, todos com dados mensais a partir do segundo ano.
+    """
+    n_municipios_total = len(read_geometrias(GEOJSON_PATH))
+    n_siglas_total = len(pd.read_csv(GLOSSARIO_PATH, sep=','))
+    alvo = LINHAS_CSV_ATUAL * fator
+
+    # Linhas por par município × indicador em `n` anos: um ano só anual e os demais com 12 meses e o consolidado
+    def linhas_por_par(n_anos):
+        return 1 + 13 * (n_anos - 1)
+
+    n_municipios = min(n_municipios_total, max(1, round(alvo / (7 * linhas_por_par(2)))))
+    n_siglas = min(n_siglas_total, max(7, round(alvo / (n_municipios * linhas_por_par(2)))))
+    n_anos = 2
+    while n_municipios * n_siglas * linhas_por_par(n_anos + 1) <= alvo * 1.05:
+        n_anos += 1
+
+    anos = range(ULTIMO_ANO - n_anos + 1, ULTIMO_ANO + 1)
+    return generate_sire_data(n_municipios, n_siglas, anos, primeiro_ano_mensal=anos[1], seed=seed)
+
+def write_scaled_csv(fator, destino, seed=42):
+    """
+    Grava em `destino` o CSV sintético de `scaled_dataset(fator)` e retorna o número de linhas.
+    """
+    data = scaled_dataset(fator, seed=seed)
+    data.to_csv(destino, index=False)
+    return len(data)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um CSV sintético de indicadores do SIRE para testes de carga.")
+    parser.add_argument("output", help="Caminho do CSV gerado")
+    parser.add_argument("--scale", type=float, help="Múltiplo do tamanho do CSV atual (ignora as demais dimensões)")
+    parser.add_argument("--municipios", type=int, help="Número de municípios (padrão: todos os do GeoJSON)")
+    parser.add_argument("--indicadores", type=int, help="Número de indicadores (padrão: todos os do glossário)")
+    parser.add_argument("--anos", type=int, nargs=2, metavar=("INICIAL", "FINAL"), default=(2023, ULTIMO_ANO))
+    parser.add_argument("--primeiro-ano-mensal", type=int, help="Primeiro ano com dados mensais (padrão: o segundo ano)")
+    parser.add_argument("--lacunas", type=float, default=0.05, help="Fração de meses não informados")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.scale:
+        linhas = write_scaled_csv(args.scale, args.output, seed=args.seed)
+    else:
+        data = generate_sire_data(
+            args.municipios, args.indicadores, range(args.anos[0], args.anos[1] + 1),
+            primeiro_ano_mensal=args.primeiro_ano_mensal, taxa_lacunas=args.lacunas, seed=args.seed,
+        )
+        data.to_csv(args.output, index=False)
+        linhas = len(data)
+    print(f"{linhas} linhas gravadas em {args.output}")
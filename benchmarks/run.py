@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+import components.charts as charts
+import components.popups as popups
+import utils.geometry as geometry
+import utils.query as query
+from benchmarks.datasets import write_scaled_csv
+from components.map import create_map, create_map_microrregioes
+from utils.data_loader import load_indicator_data
+from utils.dashboard import GEOJSON_PATH, MAP_ZOOM, load_glossario
+from utils.functions import adicionar_jitter, agrupar_dados_por_microrregiao, changeMax
+from utils.geometry import build_spatial_index, faixa_de_zoom, locate_municipio, read_geometrias, simplificar_por_zoom
+from utils.ingest import cache_dir
+from utils.microrregioes import MICRORREGIOES, OPERACOES
+
+# Escalas padrão do conjunto sintético, em múltiplos do CSV atual
+ESCALAS = [10, 100, 1000]
+
+def limpar_caches():
+    """
+    Esvazia os caches em memória do dashboard, para que cada execução meça o caminho completo.
+    """
+    popups._popup_cache.clear()
+    charts._figure_cache.clear()
+    query._query_cache.clear()
+    query._ultimo_cubo = None
+    geometry._topologia_cache.clear()
+    geometry._regioes_cache.clear()
+
+def medir(funcao, repeticoes, preparar=None):
+    """
+    Mede uma função do dashboard.
+
+    Args:
+        funcao (callable): Função a medir; se retornar um inteiro, ele é registrado como o tamanho do conteúdo gerado.
+        repeticoes (int): Número de execuções cronometradas; é registrado o menor tempo.
+        preparar (callable, optional): Executada antes de cada execução, fora da medição.
+
+    Returns:
+        dict: Tempo em segundos, pico de memória alocada (MB) e bytes do conteúdo gerado (HTML/JSON).
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        limpar_caches()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    # Execução separada para memória, já que o tracemalloc deixa a execução mais lenta
+    if preparar:
+        preparar()
+    limpar_caches()
+    tracemalloc.start()
+    resultado = funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "segundos": min(tempos),
+        "pico_mb": pico / 1024 / 1024,
+        "bytes": resultado if isinstance(resultado, int) else None,
+    }
+
+def casos(file_path, geojson, glossario_data):
+    """
+    Monta os casos medidos sobre um CSV de indicadores, com as mesmas entradas que o dashboard usa.
+
+    Returns:
+        dict: Dicionário mapeando o nome do caso para (função, preparação).
+    """
+    data = load_indicator_data(file_path)
+    ultimo_ano = int(data["Ano"].max())
+    mensal = data[(data["Ano"] == ultimo_ano) & (data["Mês_Num"] > 0)]
+    municipios = mensal["Cidade"].unique().tolist()
+    com_titulo = pd.merge(mensal, glossario_data[["Sigla", "Título"]], on="Sigla", how="left")
+
+    microrregiao_data = agrupar_dados_por_microrregiao(mensal, MICRORREGIOES, OPERACOES, False)
+    microrregiao_data = pd.merge(microrregiao_data, glossario_data[["Sigla", "Título", "Unidade"]], on="Sigla", how="left")
+    microrregiao_data["Valor"] = microrregiao_data["Valor"].apply(changeMax)
+
+    def remover_cache():
+        shutil.rmtree(cache_dir(file_path), ignore_errors=True)
+
+    indice = build_spatial_index(geojson)
+    pontos = geojson.geometry.representative_point()
+
+    def cliques():
+        for ponto in pontos:
+            locate_municipio(indice, ponto.y, ponto.x)
+
+    def popups_municipios():
+        return sum(len(popups.create_popup_with_tabs(grupo, municipio))
+                   for municipio, grupo in com_titulo.groupby("Cidade", observed=True))
+
+    def graficos():
+        # Mesma preparação de `create_comparative_chart_with_tabs`, para todas as cidades e indicadores
+        dados = adicionar_jitter(com_titulo, "Cidade").assign(
+            Período=com_titulo["Mês"].astype(str) + "/" + com_titulo["Ano"].astype(str)
+        ).sort_values(['Sigla', 'Mês_Num', 'Ano', 'Cidade'])
+        total = 0
+        for indicador, indicador_data in dados.groupby("Sigla", observed=True):
+            total += len(charts._build_temporal_chart(indicador_data, "Cidade", indicador, "Comparação Temporal", "Valor", 100).to_json())
+            total += len(charts._build_faceted_chart(indicador_data, indicador).to_json())
+        return total
+
+    return {
+        "load_indicator_data (CSV)": (lambda: load_indicator_data(file_path), remover_cache),
+        "load_indicator_data (cache)": (lambda: load_indicator_data(file_path), None),
+        "agrupar_dados_por_microrregiao (anual)": (
+            lambda: agrupar_dados_por_microrregiao(data[data["Mês_Num"] == 0], MICRORREGIOES, OPERACOES, True), None
+        ),
+        "agrupar_dados_por_microrregiao (mensal)": (
+            lambda: agrupar_dados_por_microrregiao(data[data["Mês_Num"] > 0], MICRORREGIOES, OPERACOES, False), None
+        ),
+        "create_map": (
+            lambda: len(create_map(geojson, mensal, municipios, [""]).get_root().render()), None
+        ),
+        "create_map (sem popups)": (
+            lambda: len(create_map(geojson, mensal, municipios, [""], com_popups=False).get_root().render()), None
+        ),
+        "locate_municipio (um clique por município)": (cliques, None),
+        "create_map_microrregioes": (
+            lambda: len(create_map_microrregioes(geojson, microrregiao_data, MICRORREGIOES, False).get_root().render()), None
+        ),
+        "popups (municípios)": (popups_municipios, None),
+        "gráficos (temporal e subgráficos)": (graficos, None),
+    }
+
+def run(escalas, repeticoes):
+    """
+    Executa os casos em cada escala do conjunto sintético.
+
+    Returns:
+        dict: Resultados por escala e por caso (ver `medir`), com o número de linhas de cada escala.
+    """
+    geojson = simplificar_por_zoom(read_geometrias(GEOJSON_PATH))[faixa_de_zoom(MAP_ZOOM)]
+    glossario_data = load_glossario()
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        for escala in escalas:
+            file_path = os.path.join(pasta, f"sire_{escala}x.csv")
+            linhas = write_scaled_csv(escala, file_path)
+            resultados[str(escala)] = {"linhas": linhas, "casos": {}}
+            for nome, (funcao, preparar) in casos(file_path, geojson, glossario_data).items():
+                resultado = medir(funcao, repeticoes, preparar)
+                resultados[str(escala)]["casos"][nome] = resultado
+                bytes_ = f"{resultado['bytes'] / 1024:10.0f} KB" if resultado["bytes"] is not None else " " * 13
+                print(f"{escala:>5}x {nome:<42} {resultado['segundos']:8.3f} s {resultado['pico_mb']:9.1f} MB {bytes_}", flush=True)
+    return resultados
+
+def regressions(resultados, baseline, tolerancia):
+    """
+    Compara os tempos com os de uma execução anterior.
+
+    Returns:
+        list: Descrição dos casos cujo tempo aumentou mais que `tolerancia` (fração) em relação à referência.
+    """
+    encontradas = []
+    for escala, dados in resultados.items():
+        for nome, resultado in dados["casos"].items():
+            referencia = baseline.get(escala, {}).get("casos", {}).get(nome)
+            if referencia and resultado["segundos"] > referencia["segundos"] * (1 + tolerancia):
+                encontradas.append(
+                    f"{escala}x {nome}: {referencia['segundos']:.3f} s -> {resultado['segundos']:.3f} s"
+                )
+    return encontradas
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mede tempo, pico de memória e tamanho do HTML/JSON dos caminhos críticos do dashboard, sem servidor Streamlit."
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=ESCALAS, help="Escalas do conjunto sintético (múltiplos do CSV atual)")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções cronometradas por caso (registra a menor)")
+    parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados")
+    parser.add_argument("--baseline", help="Resultados JSON de referência para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Aumento de tempo tolerado em relação à referência")
+    args = parser.parse_args()
+
+    resultados = run(args.scales, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as saida:
+            json.dump(resultados, saida, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as entrada:
+            encontradas = regressions(resultados, json.load(entrada), args.tolerance)
+        for regressao in encontradas:
+            print(f"REGRESSÃO {regressao}")
+        sys.exit(1 if encontradas else 0)
@@ -1,26 +1,328 @@
+import hashlib
+import json
+import math
+import os
 import plotly.express as px
-import pandas as pd
 import streamlit as st
-import itables
-from utils.functions import display_metrics
-import numpy as np
+from components.metrics import display_metrics
+from utils.cache import LRUCache, data_fingerprint
+from utils.dashboard import INDICATOR_DATA_PATH
+from utils.functions import adicionar_jitter
+from utils.ingest import cache_dir
+from utils.profiling import timed
+from utils.schema import mes_num
+
+# Figuras já serializadas em JSON, compartilhadas entre as sessões e limitadas pela memória ocupada
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_figure_cache = LRUCache(max_entries=1024, max_bytes=FIGURE_CACHE_MAX_BYTES, sizeof=len)
+
+# Versão das figuras pré-geradas em disco; incrementar sempre que a construção dos gráficos mudar
+FIGURES_VERSION = 1
+
+def figures_dir(file_path=INDICATOR_DATA_PATH):
+    """
+    Retorna o diretório das figuras pré-geradas, dentro do cache dos dados.
+    """
+    return os.path.join(cache_dir(file_path), "figures")
+
+def _figure_key(tipo, data, params):
+    return (tipo, data_fingerprint(data)) + params
+
+def _figure_path(chave):
+    nome = hashlib.sha1(repr((FIGURES_VERSION,) + tuple(str(parte) for parte in chave)).encode()).hexdigest()
+    return os.path.join(figures_dir(), f"{chave[0]}-{nome}.json")
+
+def _load_or_build_figure(chave, data, build_figure, params):
+    """
+    Lê a figura pré-gerada em disco (ver `components.prerender`) ou, se ela não existir, constrói a figura.
+    """
+    caminho = _figure_path(chave)
+    if os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as arquivo:
+            return arquivo.read()
+    return build_figure(data, *params).to_json()
+
+def cached_figure_json(tipo, data, build_figure, *params):
+    """
+    Retorna o JSON da figura Plotly, construindo-a com `build_figure(data, *params)` apenas se ela ainda não
+    estiver no cache (em memória ou pré-gerada em disco). A chave combina o tipo do gráfico, o conteúdo dos dados
+    e os parâmetros, de forma que alterar widgets que não mudam o recorte exibido não reconstrói a figura.
+    """
+    chave = _figure_key(tipo, data, params)
+    return _figure_cache.get_or_set(chave, lambda: _load_or_build_figure(chave, data, build_figure, params))
+
+def write_figure_json(tipo, data, build_figure, *params):
+    """
+    Constrói a figura e grava o seu JSON no diretório das figuras pré-geradas, de forma atômica, com a mesma chave
+    usada por `cached_figure_json`.
+
+    Returns:
+        str: Caminho do arquivo gravado.
+    """
+    caminho = _figure_path(_figure_key(tipo, data, params))
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp_path = f"{caminho}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as arquivo:
+        arquivo.write(build_figure(data, *params).to_json())
+    os.replace(tmp_path, caminho)
+    return caminho
+
+def plotly_chart_from_json(figure_json):
+    """
+    Exibe no Streamlit uma figura Plotly serializada por `cached_figure_json`.
+    """
+    st.plotly_chart(json.loads(figure_json), use_container_width=True)
+
+def _build_annual_bar_chart(indicador_data, coluna, indicador, ano_selecionado):
+    """
+    Gráfico de barras para dados anuais, com uma barra por cidade ou microrregião (`coluna`).
+    """
+    fig = px.bar(
+        indicador_data,
+        x=coluna,
+        y="Valor",
+        text="Valor",
+        color=coluna,  # Diferenciar as barras pelas cidades ou microrregiões
+        title=f"Comparação Anual para {indicador} ({ano_selecionado})",
+        labels={"Valor": "Valor", coluna: coluna}
+    )
+    fig.update_traces(textposition="outside")
+    fig.update_layout(
+        xaxis=dict(title=coluna, tickangle=45),
+        yaxis=dict(title="Valor", range=[0, 110]),  # Ajustar o range para 0 a 100 se for percentual
+        coloraxis_showscale=False  # Remover a escala de cores, se desnecessário
+    )
+    return fig
+
+def _build_temporal_chart(indicador_data, coluna, indicador, titulo, label_jitter, y_max):
+    """
+    Gráfico de linhas para dados mensais, com uma linha (deslocada pelo jitter) por cidade ou microrregião.
+    """
+    # Garantir a ordem correta no eixo x
+    category_order = indicador_data.sort_values(["Ano", "Mês_Num"])["Período"].unique().tolist()
+    fig = px.line(
+        indicador_data,
+        x="Período",
+        y="Valor_Jitter",  # Usar o Valor com Jitter
+        text="Valor",
+        color=coluna,
+        markers=True,
+        title=f"{titulo} para {indicador}",
+        labels={"Valor_Jitter": label_jitter, "Período": "Período"},
+        category_orders={"Período": category_order},
+    )
+    fig.update_traces(textposition="bottom right")
+    fig.update_layout(
+        xaxis=dict(title="Período", tickangle=45),
+        yaxis=dict(title="Valor", range=[0, y_max]),  # Limita de 0 a 100 para percentuais
+    )
+    return fig
+
+def _build_faceted_chart(indicador_data, indicador):
+    """
+    Gráfico de subgráficos com a série mensal de cada cidade.
+    """
+    # Com muitas cidades, o espaçamento padrão entre as linhas de subgráficos (0.07) ultrapassa o limite do Plotly
+    linhas = math.ceil(indicador_data["Cidade"].nunique() / 3)
+    facet_row_spacing = min(0.07, 0.5 / (linhas - 1)) if linhas > 1 else None
+    fig = px.line(
+        indicador_data,
+        x="Período",
+        y="Valor",
+        color="Cidade",
+        markers=True,
+        facet_col="Cidade",
+        facet_col_wrap=3,
+        facet_row_spacing=facet_row_spacing,
+        title=f"Subgráficos para {indicador}",
+        labels={"Valor": "Valor", "Período": "Período"}
+    )
+    fig.update_layout(
+        xaxis=dict(title="Período", tickangle=45),
+        yaxis=dict(title="Valor", range=[0, 105]),
+    )
+    return fig
+
+def _build_grouped_bar_chart(indicador_data, indicador):
+    """
+    Gráfico de barras agrupadas por ano, com uma barra por microrregião.
+    """
+    fig = px.bar(
+        indicador_data,
+        x="Ano",
+        y="Valor",
+        color="Microrregião",
+        barmode="group",
+        title=f"Comparação Anual para {indicador}",
+        labels={"Valor": "Valor", "Ano": "Ano"}
+    )
+    fig.update_layout(xaxis=dict(title="Ano"), yaxis=dict(title="Valor"))
+    return fig
+
+def _build_municipio_chart(indicador_data, indicador, municipio, periodo_anual):
+    """
+    Série do indicador no município clicado no mapa: barras por ano no consolidado anual, linha mensal caso contrário.
+    """
+    if periodo_anual:
+        fig = px.bar(
+            indicador_data.assign(Ano=indicador_data["Ano"].astype(str)),
+            x="Ano",
+            y="Valor",
+            text="Valor",
+            title=f"{indicador} em {municipio}",
+        )
+        fig.update_traces(textposition="outside")
+    else:
+        fig = px.line(
+            indicador_data,
+            x="Período",
+            y="Valor",
+            text="Valor",
+            markers=True,
+            title=f"{indicador} em {municipio}",
+        )
+        fig.update_traces(textposition="bottom right")
+    fig.update_layout(xaxis=dict(tickangle=45), yaxis=dict(title="Valor"))
+    return fig
+
+def _annual_city_data(data, cidades, indicadores, ano_selecionado):
+    """
+    Linhas do gráfico anual de cidades: consolidado anual (sem mês) das cidades e indicadores no ano selecionado.
+    """
+    return data[
+        data["Cidade"].isin(cidades) &
+        data["Sigla"].isin(indicadores) &
+        (data["Mês_Num"] == 0) &
+        (data["Ano"] == int(ano_selecionado))
+    ]
+
+def _comparative_city_data(data, cidades, indicadores):
+    """
+    Linhas dos gráficos mensais de cidades, com `Período` e jitter fixo por cidade.
+    """
+    # Filtrar dados por cidades e indicadores, ignorando linhas sem mês definido
+    filtered_data = data[data["Cidade"].isin(cidades) & data["Sigla"].isin(indicadores) & (data["Mês_Num"] > 0)]
+
+    # Criar coluna auxiliar `Período` e jitter fixo por Cidade apenas sobre as linhas filtradas
+    filtered_data = adicionar_jitter(filtered_data, "Cidade").assign(
+        Período=filtered_data["Mês"].astype(str) + "/" + filtered_data["Ano"].astype(str)
+    )
+    return filtered_data.sort_values(['Sigla', 'Mês_Num', 'Ano', 'Cidade'])
+
+def _annual_microrregiao_data(data, microrregioes, indicadores, ano_selecionado):
+    """
+    Linhas do gráfico anual de microrregiões no ano selecionado.
+    """
+    return data[
+        data["Microrregião"].isin(microrregioes) &
+        data["Sigla"].isin(indicadores) &
+        (data["Ano"] == int(ano_selecionado))
+    ]
+
+def _comparative_microrregiao_data(data, microrregioes, indicadores):
+    """
+    Linhas dos gráficos comparativos de microrregiões, com `Período` e jitter fixo por microrregião.
+    """
+    # Filtrar dados por microrregiões e indicadores
+    filtered_data = data[data["Microrregião"].isin(microrregioes) & data["Sigla"].isin(indicadores)]
+
+    # Criar coluna auxiliar `Mês_Num`, ignorando linhas sem mês definido
+    filtered_data = filtered_data.assign(Mês_Num=mes_num(filtered_data["Mês"]))
+    filtered_data = filtered_data[filtered_data["Mês_Num"] > 0]
+    filtered_data = filtered_data.sort_values(['Sigla', 'Mês_Num', 'Ano'])
+
+    # Criar coluna auxiliar `Período` e jitter fixo por Microrregião para evitar sobreposição
+    return adicionar_jitter(filtered_data, "Microrregião").assign(
+        Período=filtered_data["Mês"].astype(str) + "/" + filtered_data["Ano"].astype(str)
+    )
+
+def city_figures(data, cidades, indicadores, periodo_anual, ano_selecionado):
+    """
+    Figuras exibidas na seção de cidades para a seleção, como `(tipo, dados, construtor, *parâmetros)` de
+    `cached_figure_json`; usadas para pré-gerar os gráficos com as mesmas chaves das abas.
+    """
+    figuras = []
+    if periodo_anual:
+        filtered_data = _annual_city_data(data, cidades, indicadores, ano_selecionado)
+    else:
+        filtered_data = _comparative_city_data(data, cidades, indicadores)
+    for indicador in indicadores:
+        indicador_data = filtered_data[filtered_data["Sigla"] == indicador]
+        if indicador_data.empty:
+            continue
+        if periodo_anual:
+            figuras.append(("barras_anual", indicador_data, _build_annual_bar_chart, "Cidade", indicador, ano_selecionado))
+        else:
+            figuras.append(("temporal", indicador_data, _build_temporal_chart, "Cidade", indicador, "Comparação Temporal", "Valor", 100))
+            figuras.append(("subgraficos", indicador_data, _build_faceted_chart, indicador))
+    return figuras
+
+def microrregiao_figures(data, microrregioes, indicadores, periodo_anual, ano_selecionado):
+    """
+    Figuras exibidas na seção de microrregiões para a seleção, como `(tipo, dados, construtor, *parâmetros)` de
+    `cached_figure_json`; usadas para pré-gerar os gráficos com as mesmas chaves das abas.
+    """
+    figuras = []
+    if periodo_anual:
+        filtered_data = _annual_microrregiao_data(data, microrregioes, indicadores, ano_selecionado)
+    else:
+        filtered_data = _comparative_microrregiao_data(data, microrregioes, indicadores)
+    for indicador in indicadores:
+        indicador_data = filtered_data[filtered_data["Sigla"] == indicador]
+        if indicador_data.empty:
+            continue
+        if periodo_anual:
+            figuras.append(("barras_anual", indicador_data, _build_annual_bar_chart, "Microrregião", indicador, ano_selecionado))
+        else:
+            figuras.append(("temporal", indicador_data, _build_temporal_chart, "Microrregião", indicador, "Comparação Mensal", "Valor (com Jitter)", 105))
+    return figuras
+
+@timed()
+def create_municipio_detail(data, municipio, periodo_anual):
+    """
+    Detalhamento do município clicado no mapa de cidades, no lugar dos popups pré-construídos: uma aba por
+    indicador com o gráfico e a tabela do período. Apenas a aba selecionada é renderizada.
+
+    Args:
+        data (pd.DataFrame): Linhas do município já filtradas, com "Título".
+        municipio (str): Nome do município.
+        periodo_anual (bool): True para o consolidado anual.
+    """
+    st.markdown(f"### Indicadores para {municipio}")
+    if data.empty:
+        st.write("Nenhum dado disponível para este município no período selecionado.")
+        return
 
+    data = data.sort_values(["Sigla", "Ano", "Mês_Num"])
+    data = data.assign(Período=data["Mês"].astype(str) + "/" + data["Ano"].astype(str))
+    indicadores = data["Sigla"].unique().tolist()
+    tabs = st.tabs(indicadores, on_change="rerun", key="abas_municipio_clicado")
+
+    for tab, indicador in zip(tabs, indicadores):
+        if not tab.open:
+            continue
+        with tab:
+            indicador_data = data[data["Sigla"] == indicador]
+            st.markdown(f"**{indicador_data['Título'].iloc[0]}** ({indicador_data['Unidade'].iloc[0]})")
+            plotly_chart_from_json(
+                cached_figure_json("municipio", indicador_data, _build_municipio_chart, indicador, municipio, periodo_anual)
+            )
+            st.dataframe(indicador_data[["Ano", "Mês", "Valor"]], hide_index=True)
+
+@timed()
 def create_annual_bar_chart(data, cidades, indicadores, ano_selecionado):
     """
     Cria gráficos de barras organizados para os indicadores selecionados no período anual.
+    Apenas a aba do indicador selecionado é renderizada.
     """
-    # Filtrar os dados para período anual (sem mês especificado)
-    filtered_data = data[
-        data["Cidade"].isin(cidades) & 
-        data["Sigla"].isin(indicadores) & 
-        (data["Mês"].isna() | (data["Mês"] == "Indefinido")) & 
-        (data["Ano"] == str(ano_selecionado))
-    ]
+    filtered_data = _annual_city_data(data, cidades, indicadores, ano_selecionado)
 
-    # Criar abas para os indicadores
-    tabs = st.tabs(indicadores)
+    # Criar abas para os indicadores; a troca de aba executa o script novamente para renderizar a nova aba
+    tabs = st.tabs(indicadores, on_change="rerun", key="abas_anual_cidades")
 
     for tab, indicador in zip(tabs, indicadores):
+        if not tab.open:
+            continue
         with tab:
             # Filtrar dados para o indicador
             indicador_data = filtered_data[filtered_data["Sigla"] == indicador]
@@ -41,69 +343,28 @@ def create_annual_bar_chart(data, cidades, indicadores, ano_selecionado):
                 continue
 
             # Gráfico de barras para dados anuais
-            fig = px.bar(
-                indicador_data,
-                x="Cidade",
-                y="Valor",
-                text="Valor",
-                color="Cidade",  # Diferenciar as barras pelas cidades
-                title=f"Comparação Anual para {indicador} ({ano_selecionado})",
-                labels={"Valor": "Valor", "Cidade": "Cidade"}
+            plotly_chart_from_json(
+                cached_figure_json("barras_anual", indicador_data, _build_annual_bar_chart, "Cidade", indicador, ano_selecionado)
             )
-            fig.update_traces(textposition="outside")
-            fig.update_layout(
-                xaxis=dict(title="Cidade", tickangle=45),
-                yaxis=dict(title="Valor", range=[0, 110]),  # Ajustar o range para 0 a 100 se for percentual
-                coloraxis_showscale=False  # Remover a escala de cores, se desnecessário
-            )
-            st.plotly_chart(fig, use_container_width=True)
 
             # Exibir tabela com os dados
             st.write(indicador_data[["Cidade", "Ano", "Valor"]])
 
+@timed()
 def create_comparative_chart_with_tabs(data, cidades, indicadores, periodo_anual, ano_selecionado):
     """
     Cria gráficos comparativos organizados em abas para os indicadores selecionados.
+    Apenas as abas selecionadas (indicador e tipo de gráfico) são renderizadas.
     """
-    # Mapeamento de meses para valores numéricos
-    meses_ordenados = {
-        "Janeiro": 1, "Fevereiro": 2, "Março": 3, "Abril": 4, "Maio": 5, "Junho": 6,
-        "Julho": 7, "Agosto": 8, "Setembro": 9, "Outubro": 10, "Novembro": 11, "Dezembro": 12
-    }
-
-    # Garantir que as colunas `Mês` e `Ano` estão preenchidas
-    data["Mês"] = data["Mês"].fillna("Indefinido")
-    data["Ano"] = data["Ano"].fillna("Indefinido")
-
-    # Criar colunas auxiliares `Mês_Num` e `Período`
-    data["Mês_Num"] = data["Mês"].map(meses_ordenados).fillna(0).astype(int)
-    data["Período"] = data["Mês"] + "/" + data["Ano"]
-
-    # Criar jitter fixo por Cidade
-    jitter_map = {cidade: np.random.uniform(-0.5, 0.5) for cidade in data["Cidade"].unique()}
-    data["Valor_Jitter"] = data.apply(lambda row: row["Valor"] + jitter_map[row["Cidade"]], axis=1)
-
-    # Filtrar dados por cidades e indicadores
-    filtered_data = data[data["Cidade"].isin(cidades) & data["Sigla"].isin(indicadores)]
-
-    # Filtrar dados para gráficos mensais e anuais
-    if periodo_anual:
-        filtered_data = filtered_data[filtered_data["Ano"] != "Indefinido"]  # Ignorar anos indefinidos
-    else:
-        filtered_data = filtered_data[
-            (filtered_data["Mês"] != "Indefinido") & (filtered_data["Ano"] != "Indefinido")
-        ]  # Ignorar meses e anos indefinidos
-
-    # Garantir que `Período` seja válido
-    filtered_data = filtered_data[~filtered_data["Período"].str.contains("Indefinido|Indefinido")]
+    filtered_data = _comparative_city_data(data, cidades, indicadores)
 
-    # Criar abas para os indicadores
-    tabs = st.tabs(indicadores)
-
-    filtered_data = filtered_data.sort_values(['Sigla', 'Mês_Num', 'Ano', 'Cidade'])
+    # Criar abas para os indicadores; a troca de aba executa o script novamente para renderizar a nova aba
+    tabs = st.tabs(indicadores, on_change="rerun", key="abas_comparativo_cidades")
 
     # Gerar gráficos para cada indicador
     for tab, indicador in zip(tabs, indicadores):
+        if not tab.open:
+            continue
         with tab:
             # Filtrar os dados do indicador
             indicador_data = filtered_data[filtered_data["Sigla"] == indicador]
@@ -127,70 +388,37 @@ def create_comparative_chart_with_tabs(data, cidades, indicadores, periodo_anual
             display_metrics(indicador, int(ano_selecionado), indicador_data["IBGE"])
 
             # Criar tabs para diferentes tipos de gráficos
-            tabs_graph = st.tabs(["Gráfico Temporal", "Subgráficos"])
-
-            with tabs_graph[0]:
-                # Gráfico de linhas para dados mensais
-                category_order = sorted(
-                    indicador_data["Período"].unique(),
-                    key=lambda x: (
-                        int(x.split("/")[1]),  # Ano
-                        meses_ordenados.get(x.split("/")[0], 0)  # Mês
+            tabs_graph = st.tabs(["Gráfico Temporal", "Subgráficos"], on_change="rerun", key=f"graficos_cidades_{indicador}")
+
+            if tabs_graph[0].open:
+                with tabs_graph[0]:
+                    # Gráfico de linhas para dados mensais
+                    plotly_chart_from_json(
+                        cached_figure_json("temporal", indicador_data, _build_temporal_chart, "Cidade", indicador, "Comparação Temporal", "Valor", 100)
+                    )
+            if tabs_graph[1].open:
+                with tabs_graph[1]:
+                    # Gráfico de subgráficos para cada cidade
+                    plotly_chart_from_json(
+                        cached_figure_json("subgraficos", indicador_data, _build_faceted_chart, indicador)
                     )
-                )
-                fig_temporal = px.line(
-                    indicador_data,
-                    x="Período",
-                    y="Valor_Jitter",  # Usar o Valor com Jitter
-                    text="Valor",
-                    color="Cidade",
-                    markers=True,
-                    title=f"Comparação Temporal para {indicador}",
-                    labels={"Valor_Jitter": "Valor", "Período": "Período"},
-                    category_orders={"Período": category_order},
-                )
-                fig_temporal.update_traces(textposition="bottom right")
-                fig_temporal.update_layout(
-                    xaxis=dict(title="Período", tickangle=45),
-                    yaxis=dict(title="Valor", range=[0, 100]),  # Limita de 0 a 100 para percentuais
-                )
-                st.plotly_chart(fig_temporal, use_container_width=True)
-            with tabs_graph[1]:
-                # Gráfico de subgráficos para cada cidade
-                fig_faceted = px.line(
-                    indicador_data,
-                    x="Período",
-                    y="Valor",
-                    color="Cidade",
-                    markers=True,
-                    facet_col="Cidade",
-                    facet_col_wrap=3,
-                    title=f"Subgráficos para {indicador}",
-                    labels={"Valor": "Valor", "Período": "Período"}
-                )
-                fig_faceted.update_layout(
-                    xaxis=dict(title="Período", tickangle=45),
-                    yaxis=dict(title="Valor", range=[0, 105]),
-                )
-                st.plotly_chart(fig_faceted, use_container_width=True)
 
             st.write(indicador_data[['Cidade', 'Período', 'Valor']])
 
+@timed()
 def create_annual_bar_chart_microrregioes(data, microrregioes, indicadores, ano_selecionado):
     """
     Cria gráficos de barras organizados para os indicadores selecionados no período anual, adaptados para microrregiões.
+    Apenas a aba do indicador selecionado é renderizada.
     """
-    # Filtrar os dados para período anual (sem mês especificado)
-    filtered_data = data[
-        data["Microrregião"].isin(microrregioes) & 
-        data["Sigla"].isin(indicadores) &  
-        (data["Ano"] == str(ano_selecionado))
-    ]
+    filtered_data = _annual_microrregiao_data(data, microrregioes, indicadores, ano_selecionado)
 
-    # Criar abas para os indicadores
-    tabs = st.tabs(indicadores)
+    # Criar abas para os indicadores; a troca de aba executa o script novamente para renderizar a nova aba
+    tabs = st.tabs(indicadores, on_change="rerun", key="abas_anual_microrregioes")
 
     for tab, indicador in zip(tabs, indicadores):
+        if not tab.open:
+            continue
         with tab:
             # Filtrar dados para o indicador
             indicador_data = filtered_data[filtered_data["Sigla"] == indicador]
@@ -211,74 +439,29 @@ def create_annual_bar_chart_microrregioes(data, microrregioes, indicadores, ano_
                 continue
 
             # Gráfico de barras para dados anuais
-            fig = px.bar(
-                indicador_data,
-                x="Microrregião",
-                y="Valor",
-                text="Valor",
-                color="Microrregião",  # Diferenciar as barras pelas microrregiões
-                title=f"Comparação Anual para {indicador} ({ano_selecionado})",
-                labels={"Valor": "Valor", "Microrregião": "Microrregião"}
-            )
-            fig.update_traces(textposition="outside")
-            fig.update_layout(
-                xaxis=dict(title="Microrregião", tickangle=45),
-                yaxis=dict(title="Valor", range=[0, 110]),  # Ajustar o range para 0 a 100 se for percentual
-                coloraxis_showscale=False  # Remover a escala de cores, se desnecessário
+            plotly_chart_from_json(
+                cached_figure_json("barras_anual", indicador_data, _build_annual_bar_chart, "Microrregião", indicador, ano_selecionado)
             )
-            st.plotly_chart(fig, use_container_width=True)
 
             # Exibir tabela com os dados
             st.write(indicador_data[["Microrregião", "Ano", "Valor"]])
 
 
+@timed()
 def create_comparative_chart_with_tabs_microrregioes(data, microrregioes, indicadores, periodo_anual, ano_selecionado):
     """
     Cria gráficos comparativos organizados em abas para os indicadores selecionados, adaptados para microrregiões, com Jitter.
+    Apenas a aba do indicador selecionado é renderizada.
     """
-    # Mapeamento de meses para valores numéricos
-    meses_ordenados = {
-        "Janeiro": 1, "Fevereiro": 2, "Março": 3, "Abril": 4, "Maio": 5, "Junho": 6,
-        "Julho": 7, "Agosto": 8, "Setembro": 9, "Outubro": 10, "Novembro": 11, "Dezembro": 12
-    }
+    filtered_data = _comparative_microrregiao_data(data, microrregioes, indicadores)
 
-    # Garantir que as colunas `Mês` e `Ano` estão preenchidas
-    data["Mês"] = data["Mês"].fillna("Indefinido")
-    data["Ano"] = data["Ano"].fillna("Indefinido")
-
-    # Criar colunas auxiliares `Mês_Num` e `Período`
-    data["Mês_Num"] = data["Mês"].map(meses_ordenados).fillna(0).astype(int)
-    data["Período"] = data["Mês"] + "/" + data["Ano"]
-
-    # Filtrar dados por microrregiões e indicadores
-    filtered_data = data[data["Microrregião"].isin(microrregioes) & data["Sigla"].isin(indicadores)]
-    
-    # Filtrar dados para gráficos mensais e anuais
-    if periodo_anual:
-        filtered_data = filtered_data[filtered_data["Ano"] != "Indefinido"]  # Ignorar anos indefinidos
-    else:
-        filtered_data = filtered_data[
-            (filtered_data["Mês"] != "Indefinido") & (filtered_data["Ano"] != "Indefinido")
-        ]  # Ignorar meses e anos indefinidos
-
-    # Garantir que `Período` seja válido
-    filtered_data = filtered_data[~filtered_data["Período"].str.contains("Indefinido|Indefinido")]
-    filtered_data = filtered_data.sort_values(['Sigla', 'Mês_Num', 'Ano'])
-
-    # Adicionar coluna Jitter para evitar sobreposição
-    jitter_values = {}
-    for microrregiao in filtered_data["Microrregião"].unique():
-        jitter = 0
-        for idx in filtered_data[filtered_data["Microrregião"] == microrregiao].index:
-            jitter_values[idx] = jitter
-            jitter += 0.2  # Incremento do Jitter para diferenciar as linhas
-    filtered_data["Valor_Jitter"] = filtered_data.index.map(jitter_values).fillna(0) + filtered_data["Valor"]
-
-    # Criar abas para os indicadores
-    tabs = st.tabs(indicadores)
+    # Criar abas para os indicadores; a troca de aba executa o script novamente para renderizar a nova aba
+    tabs = st.tabs(indicadores, on_change="rerun", key="abas_comparativo_microrregioes")
 
     # Gerar gráficos para cada indicador
     for tab, indicador in zip(tabs, indicadores):
+        if not tab.open:
+            continue
         with tab:
             # Filtrar os dados do indicador
             indicador_data = filtered_data[filtered_data["Sigla"] == indicador]
@@ -297,50 +480,20 @@ def create_comparative_chart_with_tabs_microrregioes(data, microrregioes, indica
             if indicador_data.empty:
                 st.write("Nenhum dado disponível para este indicador.")
                 continue
-            
+
             # Exibir métricas
             display_metrics(indicador, int(ano_selecionado))
-            
+
             if periodo_anual:
                 # Gráfico de barras para dados anuais
-                fig = px.bar(
-                    indicador_data,
-                    x="Ano",
-                    y="Valor",
-                    color="Microrregião",
-                    barmode="group",
-                    title=f"Comparação Anual para {indicador}",
-                    labels={"Valor": "Valor", "Ano": "Ano"}
+                plotly_chart_from_json(
+                    cached_figure_json("barras_agrupadas", indicador_data, _build_grouped_bar_chart, indicador)
                 )
-                fig.update_layout(xaxis=dict(title="Ano"), yaxis=dict(title="Valor"))
-                st.plotly_chart(fig, use_container_width=True)
             else:
-                # Garantir a ordem correta no eixo x
-                category_order = sorted(
-                    indicador_data["Período"].unique(),
-                    key=lambda x: (
-                        int(x.split("/")[1]),  # Ano
-                        meses_ordenados.get(x.split("/")[0], 0)  # Mês
-                    )
-                )
                 # Gráfico de linhas para dados mensais com Jitter
-                fig = px.line(
-                    indicador_data,
-                    x="Período",
-                    y="Valor_Jitter",
-                    text="Valor",
-                    color="Microrregião",
-                    markers=True,
-                    title=f"Comparação Mensal para {indicador}",
-                    labels={"Valor_Jitter": "Valor (com Jitter)", "Período": "Período"},
-                    category_orders={"Período": category_order},
-                )
-                fig.update_layout(
-                    xaxis=dict(title="Período", tickangle=45),
-                    yaxis=dict(title="Valor", range=[0, 105]),
+                plotly_chart_from_json(
+                    cached_figure_json("temporal", indicador_data, _build_temporal_chart, "Microrregião", indicador, "Comparação Mensal", "Valor (com Jitter)", 105)
                 )
-                fig.update_traces(textposition="bottom right")
-                st.plotly_chart(fig, use_container_width=True)
 
                 st.write(indicador_data[['Microrregião', 'Período', 'Valor']])
 
@@ -348,4 +501,4 @@ def create_comparative_chart_with_tabs_microrregioes(data, microrregioes, indica
                 #st.dataframe(indicador_data.style.hide(axis="index"))
                 #st.markdown(indicador_data.style.hide(axis="index").to_html(), unsafe_allow_html=True)
                 #indicador_data_table=pd.DataFrame(indicador_data[['Período','Valor']])
-                #st.components.v1.html(itables.to_html_datatable(indicador_data_table), height=400)
\ No newline at end of file
+                #st.components.v1.html(itables.to_html_datatable(indicador_data_table), height=400)
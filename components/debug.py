@@ -0,0 +1,64 @@
+import functools
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.profiling import PROFILING, measure, rerun_records, start_rerun
+
+# Número de execuções isoladas de fragmentos mantidas no painel de desempenho
+MAX_EXECUCOES_FRAGMENTOS = 10
+
+def _fragment_rerun():
+    """
+    Indica se a execução atual é de um fragmento isolado (sem executar a página inteira).
+    """
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+def profiled_section(secao):
+    """
+    Decorador das seções (fragmentos) da página: mede a seção e, quando apenas o fragmento é executado novamente,
+    guarda as medições dessa execução para o painel de desempenho.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def instrumentada(*args, **kwargs):
+            if not PROFILING:
+                return funcao(*args, **kwargs)
+            isolada = _fragment_rerun()
+            if isolada:
+                start_rerun(secao)
+            with measure(secao):
+                resultado = funcao(*args, **kwargs)
+            if isolada:
+                execucoes = st.session_state.setdefault("perfil_fragmentos", [])
+                execucoes.append(rerun_records())
+                del execucoes[:-MAX_EXECUCOES_FRAGMENTOS]
+            return resultado
+        return instrumentada
+    return decorador
+
+def _tabela_perfil(registros):
+    """
+    Tabela das medições, com as etapas recuadas conforme o aninhamento.
+    """
+    tabela = pd.DataFrame(registros)
+    tabela["etapa"] = ["· " * nivel + etapa for nivel, etapa in zip(tabela["nivel"], tabela["etapa"])]
+    return tabela[["etapa", "segundos", "memoria_mb", "pico_mb"]]
+
+def show_profile_panel():
+    """
+    Painel de depuração na barra lateral com o tempo e a memória de cada etapa da execução atual e das últimas
+    execuções isoladas de fragmentos. Exibido apenas com SIRE_PROFILE=1.
+    """
+    if not PROFILING:
+        return
+    registros = rerun_records()
+    with st.sidebar.expander("Desempenho (debug)"):
+        total = sum(registro["segundos"] for registro in registros if registro["nivel"] == 0)
+        st.caption(f"Execução {registros[0]['execucao'] if registros else '-'}: {total:.3f} s")
+        if registros:
+            st.dataframe(_tabela_perfil(registros), hide_index=True)
+        for execucao in reversed(st.session_state.get("perfil_fragmentos", [])):
+            if execucao:
+                st.caption(f"Fragmento {execucao[0]['origem']} ({execucao[0]['execucao']})")
+                st.dataframe(_tabela_perfil(execucao), hide_index=True)
@@ -0,0 +1,234 @@
+import pathlib
+import streamlit as st
+from streamlit_folium import st_folium
+from components.debug import profiled_section
+from components.map import create_map, create_map_microrregioes
+from components.static_maps import find_static_map
+from components.tables import show_detailed_table
+from components.charts import create_comparative_chart_with_tabs, create_comparative_chart_with_tabs_microrregioes, create_annual_bar_chart, create_annual_bar_chart_microrregioes, create_municipio_detail
+from utils.dashboard import GEOJSON_PATH, MAP_ZOOM, city_view_data, microrregiao_view_data
+from utils.data_loader import load_spatial_index
+from utils.geometry import locate_municipio
+from utils.microrregioes import MICRORREGIOES, cidades_microrregioes
+from utils.profiling import measure
+from utils.query import filter_indicator_data
+
+# Cada seção da página é um fragmento: interagir com um widget de uma seção executa novamente apenas essa seção.
+# Os filtros globais (barra lateral) são lidos no script principal e repassados às seções; os widgets de cada
+# seção guardam seu estado em `st.session_state` pela chave.
+
+# Estilos personalizados da tabela do glossário
+GLOSSARIO_CSS = """
+<style>
+.custom-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 20px 0;
+    font-size: 16px;
+    text-align: left;
+}
+.custom-table th {
+    background-color: #003893; /* Cor do cabeçalho */
+    color: white;
+    padding: 12px;
+    text-align: center;
+}
+.custom-table td {
+    border: 1px solid #ddd;
+    padding: 8px;
+    font-weight:600;
+}
+.custom-table tr:hover {
+    background-color: #4eacfa; /* Efeito hover */
+}
+</style>
+"""
+
+@st.fragment
+@profiled_section("glossário")
+def show_glossario(general_indicator_value):
+    """
+    Exibe o glossário com a sigla e o título dos indicadores disponíveis.
+    """
+    st.markdown("### Glossário de Indicadores")
+    glossario = general_indicator_value[["Sigla", "Título"]].drop_duplicates().sort_values("Sigla")
+
+    # Criar HTML da tabela sem índice
+    glossario_html = glossario.to_html(index=False, escape=False, classes="custom-table")
+
+    # Exibir a tabela estilizada no Streamlit
+    st.markdown(GLOSSARIO_CSS + glossario_html, unsafe_allow_html=True)
+
+@st.fragment
+@profiled_section("mapa")
+def show_map(build_map, static_map, key):
+    """
+    Exibe um mapa em um fragmento próprio, de forma que o mapa não execute novamente o restante da página.
+    Se houver um mapa pré-gerado para a seleção (`static_map`), ele é servido diretamente; caso contrário,
+    o mapa folium é construído com `build_map()`.
+    """
+    if static_map is not None:
+        with measure(f"mapa pré-gerado ({key})"):
+            st.iframe(pathlib.Path(static_map), width=1000, height=600)
+        return
+    mapa = build_map()
+    # Nenhum valor do mapa é usado pelo dashboard, então interações com o mapa não disparam novas execuções
+    with measure(f"st_folium ({key})"):
+        st_folium(mapa, width=1000, height=600, key=key, returned_objects=[])
+
+@st.fragment
+@profiled_section("mapa de cidades")
+def show_clickable_map(build_map, on_click, key):
+    """
+    Exibe um mapa cujo clique é resolvido no servidor para o IBGE do município (pelo índice espacial das geometrias
+    exibidas) e detalhado com `on_click(ibge)` abaixo do mapa. Mapa e detalhamento ficam no mesmo fragmento, então um
+    clique executa novamente apenas essa parte da página.
+    """
+    mapa = build_map()
+    with measure(f"st_folium ({key})"):
+        retorno = st_folium(mapa, width=1000, height=600, key=key, returned_objects=["last_clicked"])
+
+    clique = (retorno or {}).get("last_clicked")
+    ibge = locate_municipio(load_spatial_index(GEOJSON_PATH, MAP_ZOOM), clique["lat"], clique["lng"]) if clique else None
+    if ibge is None:
+        st.caption("Clique em um município no mapa para ver os seus indicadores.")
+        return
+    on_click(ibge)
+
+@st.fragment
+@profiled_section("cidades")
+def show_city_view(indicator_data, versao_base, glossario_data, geojson, filtros, nao_atendidas):
+    """
+    Seção "Visualização por Cidade": tabela detalhada, gráficos e mapa dos municípios selecionados.
+
+    Args:
+        indicator_data (pd.DataFrame): Dados dos indicadores já restritos ao recorte base do dashboard.
+        versao_base (hashable): Chave de cache de `indicator_data` (ver `utils.query.query_key`).
+        glossario_data (pd.DataFrame): Glossário dos indicadores.
+        geojson (gpd.GeoDataFrame): Geometrias dos municípios.
+        filtros (dict): Filtros globais da barra lateral (indicadores, anos, meses, ano_inicial e is_anual).
+        nao_atendidas (list): IBGEs de cidades não atendidas.
+    """
+    st.markdown("### Visualização por Cidade")
+
+    # Filtros para cidades
+    municipios = ["Todos"] + sorted(indicator_data["Cidade"].unique())
+    municipios_selecionados = st.multiselect(
+        "Selecione os Municípios", municipios, default="Todos", key="municipios_selecionados"
+    )
+
+    if "Todos" in municipios_selecionados:
+        municipios_selecionados = indicator_data["Cidade"].unique().tolist()
+
+    is_anual = filtros["is_anual"]
+
+    # Filtrar os dados
+    filtered_data_cidades = city_view_data(indicator_data, versao_base, filtros, municipios_selecionados)
+    general_indicator_value = filter_indicator_data(
+        indicator_data, versao_base, glossario=glossario_data, anos=filtros["anos"]
+    )
+    # Exibir tabelas e mapa para cidades
+    #show_consolidated_table(filtered_data_cidades, indicadores_selecionados, is_anual)
+
+    if is_anual:
+        show_detailed_table(general_indicator_value, is_anual)
+        st.markdown("## Gráfico de Período Anual")
+        create_annual_bar_chart(
+            data=general_indicator_value,
+            cidades=municipios_selecionados,
+            indicadores=filtros["indicadores"],
+            ano_selecionado=filtros["ano_inicial"]
+        )
+    else:
+        show_detailed_table(filtered_data_cidades, is_anual)
+        create_comparative_chart_with_tabs(
+            data=general_indicator_value,
+            cidades=municipios_selecionados,
+            indicadores=filtros["indicadores"],
+            periodo_anual=is_anual,
+            ano_selecionado=filtros["ano_inicial"]
+        )
+
+    def detalhar_municipio(ibge):
+        # Apenas o município clicado é consultado e renderizado
+        periodo = {"anual": True} if is_anual else {"meses": filtros["meses"]}
+        municipio_data = filter_indicator_data(
+            indicator_data, versao_base, glossario=glossario_data,
+            siglas=filtros["indicadores"], anos=filtros["anos"], ibges=[ibge], **periodo
+        )
+        municipio = geojson.loc[geojson["id"].astype(str) == ibge, "name"].iloc[0].upper()
+        create_municipio_detail(municipio_data, municipio, is_anual)
+
+    # O mapa de cidades não tem popups: o município clicado é detalhado abaixo do mapa
+    show_clickable_map(
+        lambda: create_map(geojson, filtered_data_cidades, municipios_selecionados, nao_atendidas, com_popups=False),
+        detalhar_municipio,
+        key="mapa_cidades",
+    )
+
+@st.fragment
+@profiled_section("microrregiões")
+def show_microrregiao_view(indicator_data, versao_base, glossario_data, geojson, filtros):
+    """
+    Seção "Visualização por Microrregiões": dados consolidados, gráficos e mapa das microrregiões selecionadas.
+
+    Args:
+        indicator_data (pd.DataFrame): Dados dos indicadores já restritos ao recorte base do dashboard.
+        versao_base (hashable): Chave de cache de `indicator_data` (ver `utils.query.query_key`).
+        glossario_data (pd.DataFrame): Glossário dos indicadores.
+        geojson (gpd.GeoDataFrame): Geometrias dos municípios.
+        filtros (dict): Filtros globais da barra lateral (indicadores, anos, meses, ano_inicial e is_anual).
+    """
+    st.markdown("### Visualização por Microrregiões")
+
+    is_anual = filtros["is_anual"]
+    indicadores_selecionados = filtros["indicadores"]
+
+    microrregiao_data = microrregiao_view_data(indicator_data, versao_base, glossario_data, filtros)
+    # Adicionar seleção de microrregiões
+    microrregioes_disponiveis = ["Todas"] + list(MICRORREGIOES.keys())
+    microrregioes_selecionadas = st.multiselect(
+        "Selecione as Microrregiões", microrregioes_disponiveis, default="Todas", key="microrregioes_selecionadas"
+    )
+
+    cidades_selecionadas = cidades_microrregioes(microrregioes_selecionadas)
+
+    # Filtrar dados consolidados para microrregiões selecionadas
+    if "Todas" in microrregioes_selecionadas:
+        filtered_data_microrregioes = microrregiao_data  # Mantém todos os dados
+    else:
+        filtered_data_microrregioes = microrregiao_data[
+            microrregiao_data["Microrregião"].isin(microrregioes_selecionadas)
+        ]
+    # Exibir tabela consolidada
+    #show_consolidated_table(filtered_data_microrregioes, indicadores_selecionados, is_anual)
+
+    for microrregiao in microrregioes_selecionadas:
+        if(microrregiao == 'Todas'):
+            microrregioes_selecionadas = list(MICRORREGIOES.keys())
+            break
+
+    if is_anual:
+        st.markdown("## Gráfico Anual por Microrregiões")
+        create_annual_bar_chart_microrregioes(
+            data=microrregiao_data,
+            microrregioes=microrregioes_selecionadas,
+            indicadores=indicadores_selecionados,
+            ano_selecionado=filtros["ano_inicial"]
+        )
+    else:
+        st.write(filtered_data_microrregioes[["Mês","Ano","Sigla","Valor"]])
+        create_comparative_chart_with_tabs_microrregioes(
+                filtered_data_microrregioes,
+                microrregioes=microrregioes_selecionadas,
+                indicadores=indicadores_selecionados,
+                periodo_anual=is_anual,
+                ano_selecionado=filtros["ano_inicial"]
+            )
+    #create_comparative_chart_with_tabs_microrregioes(filtered_data_microrregioes, microrregioes, general_indicator_value, is_anual)
+    # Criar mapa para microrregiões
+    show_map(
+        lambda: create_map_microrregioes(geojson, filtered_data_microrregioes, MICRORREGIOES, is_anual),
+        find_static_map("microrregioes", filtered_data_microrregioes, is_anual),
+        key="mapa_microrregioes",
+    )
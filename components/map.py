@@ -1,19 +1,56 @@
-from components.popups import create_popup_with_tabs, create_custom_popup_microrregiao, create_popup_with_tabs_microrregioes
+from components.popups import create_popup_with_tabs, create_custom_popup_microrregiao, create_popup_with_tabs_microrregioes, add_popup_assets
+from utils.geometry import OBJETO_TOPOJSON, dissolve_regions, internal_borders, to_topojson
+from utils.profiling import timed
 import folium
 from folium.plugins import Fullscreen
 
-def create_map(geojson, data, municipios_selecionados, nao_atendidas):
+def _add_choropleth_layer(mapa, camada, fill_opacity):
+    """
+    Adiciona ao mapa uma única camada TopoJSON com cor, tooltip e popup lidos das propriedades de cada feição.
+    As fronteiras compartilhadas entre municípios são enviadas uma única vez, com coordenadas quantizadas.
+
+    Args:
+        mapa (folium.Map): Mapa que receberá a camada.
+        camada (gpd.GeoDataFrame): Geometrias com as colunas "cor", "tooltip" e, opcionalmente, "popup".
+        fill_opacity (float): Opacidade do preenchimento dos polígonos.
+    """
+    colunas = [coluna for coluna in ["cor", "tooltip", "popup"] if coluna in camada.columns]
+    camada_topojson = folium.TopoJson(
+        to_topojson(camada[colunas + ["geometry"]]),
+        f"objects.{OBJETO_TOPOJSON}",
+        style_function=lambda feature: {
+            "fillColor": feature["properties"]["cor"],
+            "color": "black",
+            "weight": 1,
+            "fillOpacity": fill_opacity,
+        },
+        tooltip=folium.GeoJsonTooltip(fields=["tooltip"], labels=False),
+    )
+    if "popup" in colunas:
+        camada_topojson.add_child(folium.GeoJsonPopup(fields=["popup"], labels=False, localize=False, max_width=1000))
+    camada_topojson.add_to(mapa)
+
+@timed()
+def create_map(geojson, data, municipios_selecionados, nao_atendidas, com_popups=True):
     """
     Gera um mapa interativo com as cidades selecionadas e popups organizados em abas.
+    Com `com_popups=False`, nenhum popup é construído: o mapa exibe apenas as cores e o nome no tooltip, e o
+    detalhamento é feito a partir do clique (ver `utils.geometry.locate_municipio`).
     """
     map_center = [-7.1212, -36.7246]
     mapa = folium.Map(location=map_center, zoom_start=8)
 
     Fullscreen(position="topright", title="Tela cheia", title_cancel="Sair da tela cheia").add_to(mapa)
+    if com_popups:
+        add_popup_assets(mapa)
+
+    # Separar os dados por município em uma única passada
+    dados_por_municipio = {ibge: grupo for ibge, grupo in data.groupby("IBGE", observed=True)}
 
-    for _, row in geojson.iterrows():
-        municipio = row["name"].upper()
-        municipio_id = row["id"]
+    cores, tooltips, popups = [], [], []
+    for row in geojson.itertuples():
+        municipio = row.name.upper()
+        municipio_id = row.id
 
         # Verificar se a cidade está na lista de não atendidas
         if municipio_id in nao_atendidas:
@@ -21,12 +58,12 @@ def create_map(geojson, data, municipios_selecionados, nao_atendidas):
             popup_info = f"<b>{municipio}</b><br>Não atendida."
         else:
             # Filtrar os dados para a cidade atual
-            municipio_data = data[data["IBGE"] == municipio_id].copy()
+            municipio_data = dados_por_municipio.get(municipio_id)
 
-            if not municipio_data.empty:  # Cidade com dados
+            if municipio_data is not None:  # Cidade com dados
                 if municipio in municipios_selecionados:
                     color = "blue"
-                    popup_info = create_popup_with_tabs(municipio_data, municipio)
+                    popup_info = create_popup_with_tabs(municipio_data, municipio) if com_popups else None
                 else:  # Cidade não selecionada (fora do filtro)
                     color = "gray"
                     popup_info = f"<b>{municipio}</b><br>Sem dados disponíveis (fora do filtro)."
@@ -38,65 +75,52 @@ def create_map(geojson, data, municipios_selecionados, nao_atendidas):
                     color = "gray"
                     popup_info = f"<b>{municipio}</b><br>Sem dados disponíveis (fora do filtro)."
 
-        # Adicionar a cidade ao mapa
-        folium.GeoJson(
-            row.geometry,
-            style_function=lambda x, col=color: {
-                "fillColor": col,
-                "color": "black",
-                "weight": 1,
-                "fillOpacity": 0.7,
-            },
-            tooltip=municipio,
-            popup=folium.Popup(popup_info, max_width=1000),
-        ).add_to(mapa)
+        cores.append(color)
+        tooltips.append(municipio)
+        popups.append(popup_info)
+
+    # Adicionar todas as cidades ao mapa em uma única camada
+    camada = geojson.assign(cor=cores, tooltip=tooltips)
+    if com_popups:
+        camada = camada.assign(popup=popups)
+    _add_choropleth_layer(mapa, camada, fill_opacity=0.7)
 
     return mapa
 
-def create_map_microrregioes(geojson, microrregiao_data, microrregioes, is_anual):
+@timed()
+def create_map_microrregioes(geojson, microrregiao_data, microrregioes, is_anual, bordas_municipios=True):
     """
-    Cria um mapa com as cidades exibindo dados consolidados por microrregião.
+    Cria um mapa com as microrregiões exibindo os dados consolidados: um polígono (união das cidades) e um popup por
+    microrregião e, opcionalmente, os limites municipais como uma camada fina sem interação.
     """
     mapa = folium.Map(location=[-7.1212, -36.7246], zoom_start=8)
     Fullscreen(position="topright").add_to(mapa)
+    add_popup_assets(mapa)
 
     # Definir cores únicas para cada microrregião
     cores = ["red", "green", "orange", "blue", "purple", "yellow"]
     cor_microrregiao = {microrregiao: cores[i % len(cores)] for i, microrregiao in enumerate(microrregioes)}
 
-    # Iterar sobre as cidades no GeoJSON
-    for _, row in geojson.iterrows():
-        municipio = row["name"]
-        municipio_id = str(row["id"])
-
-        # Identificar a microrregião da cidade
-        microrregiao = next(
-            (m for m, cidades in microrregioes.items() if municipio_id in cidades), None
-        )
-
-        if microrregiao:
-            color = cor_microrregiao[microrregiao]
-
-            # Filtrar os dados da microrregião
-            dados_microrregiao = microrregiao_data[microrregiao_data["Microrregião"] == microrregiao].copy()
-            
-            # Atualizar a coluna "Mês" para "Indefinido" explicitamente usando `.loc`
-            dados_microrregiao.loc[:, "Mês"] = "Indefinido"
-
-            # Criar popup com os dados da microrregião
-            popup_info = create_popup_with_tabs_microrregioes(dados_microrregiao, microrregiao, is_anual)
-
-            # Adicionar a cidade ao mapa com o estilo da microrregião
-            folium.GeoJson(
-                row.geometry,
-                style_function=lambda x, color=color: {
-                    "fillColor": color,
-                    "color": "black",
-                    "weight": 1,
-                    "fillOpacity": 0.5,
-                },
-                tooltip=folium.Tooltip(f"{municipio} ({microrregiao})"),
-                popup=folium.Popup(popup_info, max_width=1000)
-            ).add_to(mapa)
-
-    return mapa
\ No newline at end of file
+    # Polígonos das microrregiões, calculados uma única vez a partir das geometrias das cidades
+    regioes = dissolve_regions(geojson, microrregioes)
+
+    cores_regioes, tooltips, popups = [], [], []
+    for microrregiao in regioes["Região"]:
+        # Filtrar os dados da microrregião e marcar o mês como "Indefinido"
+        dados_microrregiao = microrregiao_data[microrregiao_data["Microrregião"] == microrregiao].assign(**{"Mês": "Indefinido"})
+        cores_regioes.append(cor_microrregiao[microrregiao])
+        tooltips.append(microrregiao)
+        popups.append(create_popup_with_tabs_microrregioes(dados_microrregiao, microrregiao, is_anual))
+
+    camada = regioes.assign(cor=cores_regioes, tooltip=tooltips, popup=popups)
+    _add_choropleth_layer(mapa, camada, fill_opacity=0.5)
+
+    if bordas_municipios:
+        # Limites municipais por cima das microrregiões, sem capturar cliques (os popups são das microrregiões)
+        folium.GeoJson(
+            internal_borders(geojson),
+            style_function=lambda feature: {"color": "black", "weight": 0.5, "opacity": 0.4},
+            interactive=False,
+        ).add_to(mapa)
+
+    return mapa
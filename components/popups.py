@@ -1,18 +1,60 @@
+import functools
+import os
 import folium
+from branca.element import MacroElement, Template
+from utils.cache import LRUCache, data_fingerprint
+from utils.schema import mes_num
+
+# Popups já renderizados, compartilhados entre sessões e identificados pela entidade e pelo conteúdo dos dados
+_popup_cache = LRUCache(max_entries=512)
+
+# Estilos e script de troca de abas compartilhados por todos os popups, servidos localmente
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POPUP_CSS_PATH = os.path.join(_ROOT_DIR, "styles", "popup.css")
+POPUP_JS_PATH = os.path.join(_ROOT_DIR, "assets", "popup.js")
+
+@functools.lru_cache(maxsize=None)
+def _read_asset(path):
+    with open(path, encoding="utf-8") as arquivo:
+        return arquivo.read()
+
+def add_popup_assets(mapa):
+    """
+    Inclui no mapa, uma única vez, os estilos e o script de abas usados pelos popups,
+    de forma que cada popup carregue apenas as suas tabelas de dados.
+    """
+    assets = MacroElement()
+    assets._template = Template("""
+        {% macro header(this, kwargs) %}
+            <style>{{ this.css }}</style>
+        {% endmacro %}
+        {% macro script(this, kwargs) %}
+            {{ this.js }}
+        {% endmacro %}
+    """)
+    assets.css = _read_asset(POPUP_CSS_PATH)
+    assets.js = _read_asset(POPUP_JS_PATH)
+    mapa.add_child(assets)
 
 def create_popup_with_tabs(data, municipio):
     """
-    Cria o conteúdo HTML do popup com abas de indicadores, organizando os dados por período e corrigindo estilo usando Bootstrap.
+    Retorna o conteúdo HTML do popup do município, renderizando-o apenas se ainda não estiver em cache.
+    """
+    chave = ("municipio", municipio, data_fingerprint(data))
+    return _popup_cache.get_or_set(chave, lambda: _render_popup_with_tabs(data, municipio))
+
+def create_popup_with_tabs_microrregioes(data, microrregiao, is_anual):
+    """
+    Retorna o conteúdo HTML do popup da microrregião, renderizando-o apenas se ainda não estiver em cache.
     """
-    # Criar uma cópia explícita do DataFrame para evitar o aviso
-    data = data.copy()
+    chave = ("microrregiao", microrregiao, is_anual, data_fingerprint(data))
+    return _popup_cache.get_or_set(chave, lambda: _render_popup_with_tabs_microrregioes(data, microrregiao, is_anual))
 
+def _render_popup_with_tabs(data, municipio):
+    """
+    Cria o conteúdo HTML do popup com abas de indicadores, organizando os dados por período e corrigindo estilo usando Bootstrap.
+    """
     # Ordenar os dados por Ano e Mês
-    meses_ordenados = {
-        "Janeiro": 1, "Fevereiro": 2, "Março": 3, "Abril": 4, "Maio": 5, "Junho": 6,
-        "Julho": 7, "Agosto": 8, "Setembro": 9, "Outubro": 10, "Novembro": 11, "Dezembro": 12
-    }
-    data["Mês_Num"] = data["Mês"].map(meses_ordenados).fillna(0).astype(int)
     data = data.sort_values(by=["Ano", "Mês_Num"])
 
     indicadores = data["Sigla"].unique()
@@ -46,52 +88,18 @@ def create_popup_with_tabs(data, municipio):
         """
     html += "</div></div>"
 
-    # Estilos Personalizados
-    custom_styles = """
-    <style>
-        .custom-table th {
-            background-color: #f2f2f2;
-            font-weight: bold;
-            text-align: left;
-        }
-        .custom-table td, .custom-table th {
-            padding: 10px;
-        }
-        .custom-table tbody tr:hover {
-            background-color: #e3f2fd; /* Azul claro ao passar o mouse */
-        }
-        .container-fluid {
-            margin: 0 auto;
-        }
-    </style>
-    """
+    return html
 
-    # Importar CSS e JS do Bootstrap
-    bootstrap_includes = """
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet" integrity="sha384-GLhlTQ8iRABdZLl6O3oVMWSktN1Hxj1qejCjt2lFRGzFgGksJ1M+GILy9NfAiBsF" crossorigin="anonymous">
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js" integrity="sha384-w76A8fYF1rQc/nI6OQSZqLZLu3RAqc2EhbYDXKt6m26iRQE+nOSO3tE2BxJ0HUsg" crossorigin="anonymous"></script>
-    """
-
-    return bootstrap_includes + custom_styles + html
-
-def create_popup_with_tabs_microrregioes(data, microrregiao, is_anual):
+def _render_popup_with_tabs_microrregioes(data, microrregiao, is_anual):
     """
     Cria o conteúdo HTML do popup com abas de indicadores para microrregiões,
     organizando os dados por período e corrigindo estilo usando Bootstrap.
     """
-    # Criar uma cópia explícita do DataFrame para evitar o aviso
-    data = data.copy()
     if(is_anual):
-        data["Mês_Num"] = data["Mês"]
-        data = data.sort_values(by=["Ano", "Mês_Num"])
+        data = data.assign(Mês_Num=data["Mês"]).sort_values(by=["Ano", "Mês_Num"])
     else:
         # Ordenar os dados por Ano e Mês
-        meses_ordenados = {
-            "Janeiro": 1, "Fevereiro": 2, "Março": 3, "Abril": 4, "Maio": 5, "Junho": 6,
-            "Julho": 7, "Agosto": 8, "Setembro": 9, "Outubro": 10, "Novembro": 11, "Dezembro": 12
-        }
-        data["Mês_Num"] = data["Mês"].map(meses_ordenados).fillna(0).astype(int)
-        data = data.sort_values(by=["Ano", "Mês_Num"])
+        data = data.assign(Mês_Num=mes_num(data["Mês"])).sort_values(by=["Ano", "Mês_Num"])
 
     indicadores = data["Sigla"].unique()
     html = f"<h4>{microrregiao}</h4>"
@@ -124,33 +132,7 @@ def create_popup_with_tabs_microrregioes(data, microrregiao, is_anual):
         """
     html += "</div></div>"
 
-    # Estilos Personalizados
-    custom_styles = """
-    <style>
-        .custom-table th {
-            background-color: #f2f2f2;
-            font-weight: bold;
-            text-align: left;
-        }
-        .custom-table td, .custom-table th {
-            padding: 10px;
-        }
-        .custom-table tbody tr:hover {
-            background-color: #e3f2fd; /* Azul claro ao passar o mouse */
-        }
-        .container-fluid {
-            margin: 0 auto;
-        }
-    </style>
-    """
-
-    # Importar CSS e JS do Bootstrap
-    bootstrap_includes = """
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet" integrity="sha384-GLhlTQ8iRABdZLl6O3oVMWSktN1Hxj1qejCjt2lFRGzFgGksJ1M+GILy9NfAiBsF" crossorigin="anonymous">
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js" integrity="sha384-w76A8fYF1rQc/nI6OQSZqLZLu3RAqc2EhbYDXKt6m26iRQE+nOSO3tE2BxJ0HUsg" crossorigin="anonymous"></script>
-    """
-
-    return bootstrap_includes + custom_styles + html
+    return html
 
 def create_custom_popup_microrregiao(microrregiao, microrregiao_data):
     """
@@ -0,0 +1,142 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from components.charts import city_figures, figures_dir, microrregiao_figures, write_figure_json
+from components.map import create_map_microrregioes
+from components.static_maps import static_map_path, static_maps_dir, write_static_map
+from utils.dashboard import (
+    ANOS_DISPONIVEIS, GEOJSON_PATH, INDICATOR_DATA_PATH, MAP_ZOOM,
+    base_indicator_data, data_version, default_filters, load_glossario, microrregiao_view_data,
+)
+from utils.geometry import faixa_de_zoom, read_geometrias, simplificar_por_zoom
+from utils.ingest import ingest_indicator_data
+from utils.microrregioes import MICRORREGIOES
+from utils.query import filter_indicator_data
+
+# Pré-geração em lote dos mapas de microrregiões e dos gráficos do dashboard para cada combinação de
+# ano × consolidado anual/mensal × seleção de microrregiões, distribuída entre processos.
+# Os mapas vão para `static_maps_dir()` e as figuras para `figures_dir()`, com as mesmas chaves que o dashboard
+# consulta (`find_static_map` e `cached_figure_json`); as seleções personalizadas continuam sendo construídas na hora.
+
+# Seleções de microrregiões pré-geradas: todas e cada microrregião isolada
+SELECOES_MICRORREGIOES = [("Todas",)] + [(microrregiao,) for microrregiao in MICRORREGIOES]
+
+# Dados carregados uma única vez em cada processo (ver `_init_worker`)
+_dados = {}
+
+def combinations():
+    """
+    Lista as combinações pré-geradas, como (ano, is_anual, seleção de microrregiões).
+    """
+    return [
+        (ano, is_anual, selecao)
+        for ano in ANOS_DISPONIVEIS
+        for is_anual in (True, False)
+        for selecao in SELECOES_MICRORREGIOES
+    ]
+
+def _init_worker():
+    """
+    Carrega geometrias, indicadores e glossário no processo, para que cada tarefa receba apenas a combinação.
+    """
+    _dados["geojson"] = simplificar_por_zoom(read_geometrias(GEOJSON_PATH))[faixa_de_zoom(MAP_ZOOM)]
+    _dados["indicator_data"], _dados["versao_base"] = base_indicator_data(
+        ingest_indicator_data(INDICATOR_DATA_PATH), data_version()
+    )
+    _dados["glossario"] = load_glossario()
+
+def _render_combination(ano, is_anual, selecao):
+    """
+    Gera os artefatos de uma combinação, com os mesmos filtros da página na seleção padrão da barra lateral:
+    o mapa e os gráficos de microrregiões da seleção e, na seleção "Todas", também os gráficos de cidades
+    (que não dependem das microrregiões selecionadas).
+
+    Returns:
+        list: Caminhos dos arquivos gravados.
+    """
+    indicator_data, versao_base, glossario = _dados["indicator_data"], _dados["versao_base"], _dados["glossario"]
+    filtros = default_filters(indicator_data, ano, is_anual)
+    gerados = []
+
+    microrregiao_data = microrregiao_view_data(indicator_data, versao_base, glossario, filtros)
+    if "Todas" in selecao:
+        microrregioes = list(MICRORREGIOES.keys())
+        filtered_data_microrregioes = microrregiao_data
+    else:
+        microrregioes = list(selecao)
+        filtered_data_microrregioes = microrregiao_data[microrregiao_data["Microrregião"].isin(microrregioes)]
+
+    caminho = static_map_path("microrregioes", filtered_data_microrregioes, is_anual)
+    write_static_map(
+        create_map_microrregioes(_dados["geojson"], filtered_data_microrregioes, MICRORREGIOES, is_anual), caminho
+    )
+    gerados.append(caminho)
+
+    figuras = microrregiao_figures(
+        filtered_data_microrregioes, microrregioes, filtros["indicadores"], is_anual, filtros["ano_inicial"]
+    )
+    if "Todas" in selecao:
+        general_indicator_value = filter_indicator_data(
+            indicator_data, versao_base, glossario=glossario, anos=filtros["anos"]
+        )
+        cidades = indicator_data["Cidade"].unique().tolist()
+        figuras += city_figures(general_indicator_value, cidades, filtros["indicadores"], is_anual, filtros["ano_inicial"])
+    for figura in figuras:
+        gerados.append(write_figure_json(*figura))
+    return gerados
+
+def _remove_stale(diretorio, extensao, gerados):
+    for antigo in glob.glob(os.path.join(diretorio, f"*{extensao}")):
+        if antigo not in gerados:
+            os.remove(antigo)
+
+def prerender(workers=None):
+    """
+    Atualiza o cache dos indicadores e pré-gera os artefatos de todas as combinações de `combinations()`,
+    distribuídas entre `workers` processos (padrão: um por núcleo). Os artefatos de versões anteriores dos dados
+    são removidos.
+
+    Returns:
+        tuple: (caminhos gerados, segundos decorridos, processos usados).
+    """
+    workers = workers or os.cpu_count() or 1
+    inicio = time.perf_counter()
+
+    # O cache Feather é atualizado uma única vez, antes dos processos, que apenas o leem
+    ingest_indicator_data(INDICATOR_DATA_PATH)
+
+    gerados = set()
+    if workers == 1:
+        _init_worker()
+        for combinacao in combinations():
+            gerados.update(_render_combination(*combinacao))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            tarefas = [pool.submit(_render_combination, *combinacao) for combinacao in combinations()]
+            for tarefa in as_completed(tarefas):
+                gerados.update(tarefa.result())
+
+    _remove_stale(static_maps_dir(), ".html", gerados)
+    _remove_stale(figures_dir(), ".json", gerados)
+    return sorted(gerados), time.perf_counter() - inicio, workers
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Atualiza o cache dos indicadores e pré-gera os mapas e gráficos do dashboard em paralelo."
+    )
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: um por núcleo)")
+    parser.add_argument("--verbose", action="store_true", help="Lista os arquivos gerados")
+    args = parser.parse_args()
+
+    gerados, segundos, workers = prerender(args.workers)
+    if args.verbose:
+        for caminho in gerados:
+            print(caminho)
+    megabytes = sum(os.path.getsize(caminho) for caminho in gerados) / 1024 / 1024
+    mapas = sum(caminho.endswith(".html") for caminho in gerados)
+    print(
+        f"{len(combinations())} combinações, {mapas} mapas e {len(gerados) - mapas} gráficos ({megabytes:.1f} MB) "
+        f"em {segundos:.1f} s com {workers} processo(s): {len(gerados) / segundos:.1f} artefatos/s"
+    )
@@ -0,0 +1,41 @@
+import hashlib
+import os
+from utils.cache import data_fingerprint
+from utils.dashboard import GEOJSON_PATH, INDICATOR_DATA_PATH, MAP_ZOOM
+from utils.ingest import cache_dir, source_fingerprint
+
+# Versão do HTML pré-gerado; incrementar sempre que a construção dos mapas mudar
+STATIC_MAPS_VERSION = 3
+
+def static_maps_dir(file_path=INDICATOR_DATA_PATH):
+    """
+    Retorna o diretório dos mapas pré-gerados, dentro do cache dos dados.
+    """
+    return os.path.join(cache_dir(file_path), "maps")
+
+def static_map_path(tipo, data, *params):
+    """
+    Retorna o caminho do mapa pré-gerado para os dados e parâmetros informados.
+    O nome do arquivo resume o tipo do mapa, o conteúdo dos dados, os parâmetros e a versão das geometrias, de forma
+    que qualquer mudança nos dados ou na seleção leva a outro arquivo.
+    """
+    chave = (STATIC_MAPS_VERSION, source_fingerprint(GEOJSON_PATH), MAP_ZOOM, tipo, data_fingerprint(data)) + params
+    nome = hashlib.sha1(repr(chave).encode()).hexdigest()
+    return os.path.join(static_maps_dir(), f"{tipo}-{nome}.html")
+
+def find_static_map(tipo, data, *params):
+    """
+    Retorna o caminho do mapa pré-gerado para a seleção, ou None se ele não existir (seleção personalizada).
+    """
+    caminho = static_map_path(tipo, data, *params)
+    return caminho if os.path.exists(caminho) else None
+
+def write_static_map(mapa, caminho):
+    """
+    Grava o HTML completo do mapa folium, de forma atômica (o nome temporário é por processo, para a
+    pré-geração em paralelo).
+    """
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp_path = f"{caminho}.{os.getpid()}.tmp"
+    mapa.save(tmp_path)
+    os.replace(tmp_path, caminho)
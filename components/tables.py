@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.profiling import timed
 
 def show_consolidated_table(data, indicadores, is_anual):
     """
@@ -19,27 +20,18 @@ def show_consolidated_table(data, indicadores, is_anual):
     else:
         st.warning("Nenhum dado consolidado disponível para os filtros selecionados.")
 
+@timed()
 def show_detailed_table(data, is_anual):
     """
     Exibe a tabela detalhada com base nos filtros aplicados.
     """
-        # Mapeamento de meses para valores numéricos
-    meses_ordenados = {
-        "Janeiro": 1, "Fevereiro": 2, "Março": 3, "Abril": 4, "Maio": 5, "Junho": 6,
-        "Julho": 7, "Agosto": 8, "Setembro": 9, "Outubro": 10, "Novembro": 11, "Dezembro": 12
-    }
-    data = data.copy()
-    # Garantir que as colunas `Mês` e `Ano` estão preenchidas
-    data["Mês"] = data["Mês"].fillna("Indefinido")
-    data["Ano"] = data["Ano"].fillna("Indefinido")
     if is_anual:
-        data = data[data['Mês']== 'Indefinido']
+        data = data[data["Mês_Num"] == 0].copy()
+        # Exibir o mês das linhas de consolidado anual como "Indefinido"
+        data["Mês"] = data["Mês"].astype(object).fillna("Indefinido")
     else:
-        # Criar colunas auxiliares `Mês_Num` e `Período`
-        data["Mês_Num"] = data["Mês"].map(meses_ordenados).fillna(0).astype(int)
-        data["Período"] = data["Mês"] + "/" + data["Ano"]
-        # Garantir que `Período` seja válido
-        data = data[~data["Período"].str.contains("Indefinido|Indefinido")]
+        # Ignorar linhas sem mês definido
+        data = data[data["Mês_Num"] > 0]
         data = data.sort_values(['Sigla','Mês_Num','Ano','Cidade'])
     # Exibir tabela detalhada
     st.markdown("### Dados Detalhados por Município")
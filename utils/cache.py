@@ -0,0 +1,89 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+import pyarrow as pa
+
+def data_fingerprint(data):
+    """
+    Calcula um resumo do conteúdo do DataFrame (colunas e valores), usado para compor chaves de cache.
+    """
+    resumo = hashlib.sha1(str(list(data.columns)).encode())
+    resumo.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return resumo.hexdigest()
+
+def read_only_frame(data):
+    """
+    Retorna o DataFrame apoiado em buffers Arrow imutáveis, para ser compartilhado entre as sessões: uma escrita
+    acidental nos valores gera erro em vez de alterar os dados das demais sessões. Com o Copy-on-Write do pandas,
+    seleções de colunas e `assign` sobre ele não copiam as colunas que não forem modificadas.
+    """
+    return pa.Table.from_pandas(data).to_pandas(split_blocks=True)
+
+class LRUCache:
+    """
+    Cache em memória com limite de entradas, descartando primeiro as entradas usadas há mais tempo.
+    Opcionalmente limita também a memória ocupada (`max_bytes`), medida pela função `sizeof` de cada valor.
+    É compartilhado entre as sessões do Streamlit (que rodam em threads), por isso o acesso é protegido por lock.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Retorna o valor associado à chave, marcando-o como usado recentemente.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        """
+        Armazena o valor e descarta as entradas mais antigas se o limite for ultrapassado.
+        """
+        size = self._sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # Valor maior que o cache inteiro: não armazenar
+        with self._lock:
+            self.total_bytes += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                antiga, _ = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(antiga)
+
+    def get_or_set(self, key, factory):
+        """
+        Retorna o valor da chave, calculando-o com `factory()` e armazenando-o se ainda não estiver no cache.
+        O cálculo é feito fora do lock para não bloquear as outras sessões.
+        """
+        sentinela = object()
+        value = self.get(key, sentinela)
+        if value is sentinela:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
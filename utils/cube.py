@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+from utils.microrregioes import MICRORREGIOES, get_ibge_index
+from utils.profiling import timed
+from utils.schema import MES_DTYPE, MESES
+
+# Região usada no nível estadual do cubo
+ESTADO = "PB"
+
+# Níveis de agregação do cubo, do mais detalhado ao mais amplo
+NIVEIS = ("Município", "Microrregião", "Estado")
+
+# Estatísticas pré-calculadas para cada célula do cubo
+ESTATISTICAS = ("mean", "sum", "min", "max", "count")
+
+# Chaves do índice do cubo; "Região" é o IBGE no nível municipal, o nome da microrregião ou o estado
+CHAVES_CUBO = ["Nível", "Região", "Sigla", "Ano", "Mês_Num"]
+
+@timed()
+def build_indicator_cube(data, microrregioes=MICRORREGIOES, niveis=NIVEIS):
+    """
+    Materializa o cubo de agregados dos indicadores: nível (município, microrregião e estado) × Sigla × Ano × Mês,
+    com média, soma, mínimo, máximo e contagem dos valores.
+
+    Args:
+        data (pd.DataFrame): DataFrame no esquema de `utils.schema.INDICATOR_SCHEMA`.
+        microrregioes (dict): Dicionário mapeando as microrregiões para os IBGEs das cidades.
+        niveis (tuple): Níveis a calcular.
+
+    Returns:
+        pd.DataFrame: Cubo indexado por `CHAVES_CUBO` (ordenado, para consultas rápidas com `.loc`), com uma coluna
+        por estatística. As linhas de consolidado anual têm "Mês_Num" igual a 0.
+    """
+    base = data[["Sigla", "Ano", "Mês_Num", "Valor"]]
+    ibges = data["IBGE"].astype(str)
+    regioes = {
+        "Município": ibges,
+        "Microrregião": ibges.map(get_ibge_index(microrregioes)),
+        "Estado": pd.Series(ESTADO, index=data.index),
+    }
+
+    partes = []
+    for nivel in niveis:
+        agregado = (
+            base.assign(Região=regioes[nivel])
+            .dropna(subset=["Região"])
+            .groupby(["Região", "Sigla", "Ano", "Mês_Num"], observed=True)["Valor"]
+            .agg(list(ESTATISTICAS))
+        )
+        # Média como soma / contagem, a mesma conta de `update_indicator_cube`
+        agregado["mean"] = agregado["sum"] / agregado["count"]
+        partes.append(pd.concat({nivel: agregado}, names=["Nível"]))
+
+    return pd.concat(partes).sort_index()
+
+def update_indicator_cube(cube, novos, microrregioes=MICRORREGIOES):
+    """
+    Atualiza o cubo com novas linhas de indicadores sem recalcular as células já existentes.
+    Apenas as células afetadas pelas novas linhas (em todos os níveis do cubo) são recombinadas.
+
+    Args:
+        cube (pd.DataFrame): Cubo de `build_indicator_cube`.
+        novos (pd.DataFrame): Novas linhas no esquema de `utils.schema.INDICATOR_SCHEMA`, que ainda não fazem parte
+            dos dados do cubo (ver `utils.ingest.new_measurements`).
+        microrregioes (dict): Dicionário mapeando as microrregiões para os IBGEs das cidades.
+
+    Returns:
+        pd.DataFrame: Novo cubo com as novas linhas incorporadas.
+    """
+    niveis = tuple(cube.index.get_level_values("Nível").unique()) or NIVEIS
+    delta = build_indicator_cube(novos, microrregioes, niveis=niveis)
+    if delta.empty:
+        return cube
+
+    afetadas = cube.index.isin(delta.index)
+    combinadas = (
+        pd.concat([cube[afetadas], delta])
+        .groupby(level=CHAVES_CUBO, observed=True)
+        .agg({"sum": "sum", "min": "min", "max": "max", "count": "sum"})
+    )
+    combinadas.insert(0, "mean", combinadas["sum"] / combinadas["count"])
+    return pd.concat([cube[~afetadas], combinadas]).sort_index()
+
+def query_cube(cube, nivel, regioes=None, siglas=None, anos=None, meses=None, anual=None):
+    """
+    Consulta as células de um nível do cubo, com os mesmos filtros de `utils.query.filter_indicator_data`.
+
+    Returns:
+        pd.DataFrame: Células selecionadas, com as chaves ("Região", "Sigla", "Ano" e "Mês_Num") como colunas.
+    """
+    fatia = cube[cube.index.get_level_values("Nível") == nivel].reset_index(level="Nível", drop=True).reset_index()
+
+    mask = pd.Series(True, index=fatia.index)
+    if regioes is not None:
+        mask &= fatia["Região"].isin(regioes)
+    if siglas is not None:
+        mask &= fatia["Sigla"].isin(siglas)
+    if anos is not None:
+        mask &= fatia["Ano"].isin(anos)
+    if meses is not None:
+        mes_inicial, mes_final = meses
+        mask &= (fatia["Mês_Num"] >= mes_inicial) & (fatia["Mês_Num"] <= mes_final)
+    if anual:
+        mask &= fatia["Mês_Num"] == 0
+    return fatia[mask]
+
+@timed()
+def consolidar_microrregioes(cube, microrregioes, operacoes, is_anual, **filtros):
+    """
+    Monta os dados consolidados por microrregião a partir do cubo, usando para cada indicador a estatística
+    definida em `operacoes`, com valores arredondados para cima.
+
+    Args:
+        cube (pd.DataFrame): Cubo de `build_indicator_cube` com o nível "Microrregião".
+        microrregioes (dict): Dicionário mapeando as microrregiões para os IBGEs das cidades.
+        operacoes (dict): Dicionário que define a operação (ex: "mean", "sum") para cada Sigla.
+        is_anual (bool): Se True, usa o consolidado anual; caso contrário, os valores mensais.
+        **filtros: siglas, anos e meses, como em `query_cube`.
+
+    Returns:
+        pd.DataFrame: DataFrame consolidado com os dados por microrregião.
+    """
+    for sigla, operacao in operacoes.items():
+        if operacao not in ESTATISTICAS:
+            raise ValueError(f"Operação '{operacao}' não suportada para o indicador '{sigla}'.")
+
+    chaves = ["Ano"] if is_anual else ["Ano", "Mês"]
+    colunas = chaves + ["Valor", "Sigla", "Microrregião"]
+
+    celulas = query_cube(cube, "Microrregião", anual=is_anual, **filtros)
+    if not is_anual:
+        celulas = celulas[celulas["Mês_Num"] > 0]
+    celulas = celulas[celulas["Região"].isin(list(microrregioes)) & celulas["Sigla"].isin(list(operacoes))]
+    if celulas.empty:
+        return pd.DataFrame(columns=colunas)
+
+    # Selecionar a estatística de cada indicador
+    operacao = celulas["Sigla"].astype(str).map(operacoes).to_numpy()
+    valores = celulas[list(ESTATISTICAS)].to_numpy()
+    posicao = pd.Index(ESTATISTICAS).get_indexer(operacao)
+    microrregiao_data = celulas[["Ano", "Sigla"]].assign(**{
+        "Microrregião": celulas["Região"],
+        "Mês": celulas["Mês_Num"].map(MESES).astype(MES_DTYPE),
+        # Arredondar os valores para cima com uma casa decimal; o arredondamento prévio em 9 casas descarta o erro
+        # de ponto flutuante das somas (que varia com a ordem de agregação) antes do teto
+        "Valor": np.ceil(np.round(valores[np.arange(len(valores)), posicao].astype("float64") * 10, 9)) / 10,
+    })
+
+    # Manter a ordem do registro de microrregiões e do dicionário de operações
+    ordem = {
+        "Microrregião": {microrregiao: i for i, microrregiao in enumerate(microrregioes)},
+        "Sigla": {sigla: i for i, sigla in enumerate(operacoes)},
+    }
+    microrregiao_data = microrregiao_data.sort_values(
+        ["Microrregião", "Sigla"] + chaves,
+        key=lambda coluna: coluna.astype(str).map(ordem[coluna.name]) if coluna.name in ordem else coluna,
+        kind="stable",
+    )
+
+    return microrregiao_data[colunas].reset_index(drop=True)
@@ -0,0 +1,127 @@
+import os
+import pandas as pd
+from utils.cube import consolidar_microrregioes
+from utils.functions import changeMax
+from utils.ingest import source_fingerprint
+from utils.microrregioes import MICRORREGIOES, OPERACOES
+from utils.profiling import timed
+from utils.query import filter_indicator_data, indicator_cube, query_key
+
+# Arquivos de origem do dashboard. O CSV de indicadores pode ser trocado pela variável de ambiente
+# SIRE_INDICATOR_DATA, por exemplo por um conjunto sintético (`python -m benchmarks.datasets`) em testes de carga
+INDICATOR_DATA_PATH = os.environ.get("SIRE_INDICATOR_DATA", "./data/sire_indicador_valor_grid.csv")
+GLOSSARIO_PATH = "./data/sire_indicador_grid.csv"
+GEOJSON_PATH = "./data/geojs-25-mun.json"
+
+# Faixa de zoom das geometrias usadas nos mapas
+MAP_ZOOM = 8
+
+# Recorte base do dashboard: indicadores, municípios e anos exibidos
+INDICADORES_DESEJADOS = ["IN200",
+                         "IN201",
+                         "IN202",
+                         "IN203",
+                         "IN204",
+                         "IN205",
+                         "IN208"]
+
+MUNICIPIOS_OBRIGATORIOS_FILTRO = ['2507507',
+                                  '2504009',
+                                  '2503704',
+                                  '2504033',
+                                  '2510808',
+                                  '2502300',
+                                  '2501153',
+                                  '2510600'
+]
+
+#anos_disponiveis = sorted(indicator_data["Ano"].unique())
+ANOS_DISPONIVEIS = [2023, 2024]
+
+FILTROS_BASE = {
+    "siglas": INDICADORES_DESEJADOS,
+    "anos": ANOS_DISPONIVEIS,
+    "ibges": MUNICIPIOS_OBRIGATORIOS_FILTRO,
+}
+
+# Com SIRE_TODOS_MUNICIPIOS=1, o recorte base mantém todos os municípios dos dados (testes de carga)
+if os.environ.get("SIRE_TODOS_MUNICIPIOS") == "1":
+    del FILTROS_BASE["ibges"]
+
+# Configuração: IBGEs de cidades não atendidas
+NAO_ATENDIDAS = [""]  # Exemplo de IBGEs de cidades não atendidas
+
+def data_version():
+    """
+    Versão dos arquivos de origem, usada como chave das consultas em cache.
+    """
+    return (source_fingerprint(INDICATOR_DATA_PATH), source_fingerprint(GLOSSARIO_PATH))
+
+@timed()
+def load_glossario():
+    """
+    Lê o glossário dos indicadores.
+    """
+    return pd.read_csv(GLOSSARIO_PATH, sep=",")
+
+@timed()
+def base_indicator_data(indicator_data, versao_dados):
+    """
+    Restringe os dados dos indicadores ao recorte base do dashboard.
+
+    Returns:
+        tuple: (DataFrame restrito, chave de cache do recorte para consultas encadeadas).
+    """
+    base = filter_indicator_data(indicator_data, versao_dados, **FILTROS_BASE)
+    return base, query_key(versao_dados, **FILTROS_BASE)
+
+def default_filters(indicator_data, ano, is_anual):
+    """
+    Filtros globais na seleção padrão da barra lateral: todos os indicadores e todos os meses do ano informado.
+    """
+    meses = sorted(indicator_data.loc[indicator_data["Mês_Num"] > 0, "Mês_Num"].unique())
+    return {
+        "indicadores": indicator_data["Sigla"].unique().tolist(),
+        "ano_inicial": ano,
+        "anos": range(ano, ano + 1),
+        "meses": (int(meses[0]), int(meses[-1])),
+        "is_anual": is_anual,
+    }
+
+@timed()
+def city_view_data(indicator_data, versao_base, filtros, municipios_selecionados):
+    """
+    Linhas dos municípios selecionados exibidas na tabela detalhada e no mapa de cidades.
+    """
+    return filter_indicator_data(
+        indicator_data,
+        versao_base,
+        siglas=filtros["indicadores"],
+        anos=filtros["anos"],
+        meses=filtros["meses"],
+        cidades=municipios_selecionados,
+    )
+
+@timed()
+def microrregiao_view_data(indicator_data, versao_base, glossario_data, filtros):
+    """
+    Dados consolidados por microrregião (consultados no cubo de agregados), com título e unidade dos indicadores.
+    """
+    # Consolidar por microrregião consultando o cubo de agregados
+    cubo = indicator_cube(indicator_data, versao_base)
+    if (filtros["is_anual"]):
+        microrregiao_data = consolidar_microrregioes(
+            cubo, MICRORREGIOES, OPERACOES, True, siglas=filtros["indicadores"], anos=filtros["anos"]
+        )
+    else:
+        microrregiao_data = consolidar_microrregioes(
+            cubo, MICRORREGIOES, OPERACOES, False, siglas=filtros["indicadores"], anos=filtros["anos"], meses=filtros["meses"]
+        )
+    microrregiao_data = pd.merge(
+        microrregiao_data,
+        glossario_data[["Sigla", "Título", "Unidade"]],  # Selecionar colunas úteis
+        on="Sigla",
+        how="left"
+    )
+    microrregiao_data["Valor"] = microrregiao_data["Valor"].apply(changeMax)
+    return microrregiao_data
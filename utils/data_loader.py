@@ -1,48 +1,60 @@
-import pandas as pd
-import geopandas as gpd
 import streamlit as st
-from utils.functions import clean_data
+from utils.cache import read_only_frame
+from utils.dashboard import base_indicator_data, load_glossario
+from utils.ingest import ingest_indicator_data
+from utils.geometry import build_spatial_index, read_geometrias, simplificar_por_zoom, faixa_de_zoom
+from utils.profiling import timed
+
+@st.cache_resource
+def load_geometry_store(file_path):
+    """
+    Lê o GeoJSON dos municípios uma única vez por processo e pré-calcula as geometrias simplificadas por faixa de zoom.
+    O resultado é compartilhado entre todas as sessões e não deve ser modificado.
+    """
+    geojson = read_geometrias(file_path)
+    store = simplificar_por_zoom(geojson)
+    store[None] = geojson
+    return store
 
-@st.cache_data
-def load_data(indicators_path, glossary_path):
+@st.cache_resource
+def load_spatial_index(file_path, zoom=None):
     """
-    Carrega e mescla os dados dos indicadores e do glossário em um único DataFrame.
+    Índice espacial das geometrias dos municípios exibidas no mapa (faixa de `zoom`), construído uma única vez por
+    processo e usado para identificar o município clicado.
     """
-    # Carregar arquivos
-    indicators_data = pd.read_csv(indicators_path)
-    glossary_data = pd.read_csv(glossary_path)
+    return build_spatial_index(load_geojson(file_path, zoom))
 
-    # Mesclar dados pelo campo 'Sigla'
-    consolidated_data = pd.merge(
-        indicators_data,
-        glossary_data[["Sigla", "Título", "Unidade"]],  # Selecionar colunas úteis
-        on="Sigla",
-        how="left"
-    )
+@timed()
+def load_geojson(file_path, zoom=None):
+    """
+    Retorna as geometrias dos municípios a partir do armazenamento em memória.
+    Se `zoom` for informado, retorna as geometrias simplificadas da faixa correspondente.
+    """
+    store = load_geometry_store(file_path)
+    if zoom is None:
+        return store[None]
+    return store[faixa_de_zoom(zoom)]
 
-    return consolidated_data
+@st.cache_resource(max_entries=2)
+def load_indicator_store(file_path, versao_dados):
+    """
+    Carrega os dados dos indicadores no recorte base do dashboard e o glossário uma única vez por versão dos arquivos
+    de origem (`versao_dados`), compartilhados entre todas as sessões. O DataFrame dos indicadores é somente leitura
+    (ver `utils.cache.read_only_frame`) e as sessões o consultam pelos filtros em cache de `utils.query`, sem manter
+    cópias próprias. Apenas as duas versões mais recentes são mantidas.
 
-def load_geojson(file_path):
-    return gpd.read_file(file_path)
+    Returns:
+        tuple: (DataFrame restrito, chave de cache do recorte para consultas encadeadas, glossário).
+    """
+    data, versao_base = base_indicator_data(load_indicator_data(file_path), versao_dados)
+    return read_only_frame(data), versao_base, load_glossario()
 
+@timed()
 def load_indicator_data(file_path):
-    data = pd.read_csv(file_path, sep=',')
-    # Limpar dados
-    columns_to_check = ["IBGE", "Cidade", "Sigla", "Ano", "Valor"]  # Colunas críticas
-    data = clean_data(data, columns_to_check)
-    
-
-    data["Ano"] = data["Ano"].astype(str)
-    data["IBGE"] = data["IBGE"].astype(str)
-
-    # Tratar valores ausentes e garantir consistência
-    data["Mês"] = data["Mês"].fillna("Indefinido")
-    data["Ano"] = data["Ano"].fillna("Sem ano").astype(str)
-
-    meses = {
-        1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril", 5: "Maio", 6: "Junho",
-        7: "Julho", 8: "Agosto", 9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
-    }
-    data["Mês"] = data["Mês"].map(meses)
-    
-    return data
+    """
+    Carrega os dados dos indicadores a partir do cache colunar (Feather) mapeado em memória.
+    O cache é regerado automaticamente quando o CSV de origem muda.
+    As colunas seguem o esquema canônico `INDICATOR_SCHEMA`: categorias para Sigla/Cidade/IBGE,
+    "Ano" e "Mês_Num" inteiros (0 no consolidado anual) e "Mês" por extenso como categoria ordenada.
+    """
+    return ingest_indicator_data(file_path)
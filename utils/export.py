@@ -0,0 +1,134 @@
+import argparse
+import os
+import sys
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.dashboard import GLOSSARIO_PATH, INDICATOR_DATA_PATH, base_indicator_data, load_glossario, microrregiao_view_data
+from utils.ingest import ingest_indicator_data, source_fingerprint
+from utils.query import filter_indicator_data
+
+# Exportação das tabelas do dashboard sem interface: reaproveita a carga, os filtros e a consolidação por microrregião
+# do dashboard, sem importar Streamlit, folium ou Plotly.
+
+# Formatos de saída aceitos, pela extensão do arquivo
+FORMATOS = {".csv": "csv", ".parquet": "parquet", ".json": "json", ".jsonl": "json"}
+
+# Linhas gravadas por vez (lotes do CSV/JSON e grupos de linhas do Parquet)
+TAMANHO_LOTE = 50_000
+
+# Intervalo de meses padrão (exclui o consolidado anual)
+TODOS_OS_MESES = (1, 12)
+
+COLUNAS_CIDADES = ["Sigla", "Título", "Valor", "Unidade", "Mês", "Ano", "Cidade", "IBGE"]
+COLUNAS_MICRORREGIOES = ["Microrregião", "Sigla", "Título", "Valor", "Unidade", "Mês", "Ano"]
+
+def load_export_data(file_path=INDICATOR_DATA_PATH):
+    """
+    Carrega os dados dos indicadores no recorte base do dashboard e o glossário.
+
+    Returns:
+        tuple: (DataFrame restrito, chave de cache do recorte, glossário).
+    """
+    versao_dados = (source_fingerprint(file_path), source_fingerprint(GLOSSARIO_PATH))
+    data, versao_base = base_indicator_data(ingest_indicator_data(file_path), versao_dados)
+    return data, versao_base, load_glossario()
+
+def city_table(data, versao_base, glossario, siglas=None, anos=None, meses=None, anual=False, ibges=None):
+    """
+    Linhas dos municípios na seleção informada, como na tabela detalhada do dashboard.
+
+    Args:
+        data, versao_base, glossario: Retorno de `load_export_data`.
+        siglas, anos, ibges (list, optional): Valores aceitos; todos se None.
+        meses (tuple, optional): Mês inicial e final (padrão: todos); ignorado se `anual`.
+        anual (bool): True para exportar apenas o consolidado anual.
+
+    Returns:
+        pd.DataFrame: Tabela com as colunas de `COLUNAS_CIDADES`.
+    """
+    filtrado = filter_indicator_data(
+        data, versao_base, glossario=glossario, siglas=siglas, anos=anos, ibges=ibges,
+        meses=None if anual else (meses or TODOS_OS_MESES), anual=anual,
+    )
+    return filtrado.sort_values(["Sigla", "Ano", "Mês_Num", "Cidade"])[COLUNAS_CIDADES]
+
+def microrregiao_table(data, versao_base, glossario, siglas=None, anos=None, meses=None, anual=False, microrregioes=None):
+    """
+    Dados consolidados por microrregião na seleção informada, com os mesmos valores exibidos no dashboard.
+
+    Args:
+        data, versao_base, glossario: Retorno de `load_export_data`.
+        siglas, anos, microrregioes (list, optional): Valores aceitos; todos se None.
+        meses (tuple, optional): Mês inicial e final (padrão: todos); ignorado se `anual`.
+        anual (bool): True para exportar o consolidado anual.
+
+    Returns:
+        pd.DataFrame: Tabela com as colunas de `COLUNAS_MICRORREGIOES` ("Mês" apenas no mensal).
+    """
+    filtros = {
+        "indicadores": siglas if siglas is not None else data["Sigla"].unique().tolist(),
+        "anos": anos if anos is not None else sorted(data["Ano"].unique().tolist()),
+        "meses": meses or TODOS_OS_MESES,
+        "is_anual": anual,
+    }
+    consolidado = microrregiao_view_data(data, versao_base, glossario, filtros)
+    if microrregioes is not None:
+        consolidado = consolidado[consolidado["Microrregião"].isin(microrregioes)]
+    return consolidado[[coluna for coluna in COLUNAS_MICRORREGIOES if coluna in consolidado.columns]]
+
+def write_table(data, destino, formato=None):
+    """
+    Grava a tabela em lotes, em CSV, Parquet ou JSON (um registro por linha).
+
+    Args:
+        data (pd.DataFrame): Tabela a gravar.
+        destino (str): Caminho do arquivo, ou "-" para a saída padrão (CSV ou JSON).
+        formato (str, optional): "csv", "parquet" ou "json"; se None, deduzido da extensão de `destino`.
+    """
+    if formato is None:
+        formato = "csv" if destino == "-" else FORMATOS.get(os.path.splitext(destino)[1].lower())
+    if formato not in FORMATOS.values():
+        raise ValueError(f"Formato de exportação não suportado: {formato or destino}")
+
+    if formato == "parquet":
+        if destino == "-":
+            raise ValueError("Parquet não pode ser gravado na saída padrão")
+        pq.write_table(pa.Table.from_pandas(data, preserve_index=False), destino, row_group_size=TAMANHO_LOTE)
+        return
+
+    saida = sys.stdout if destino == "-" else open(destino, "w", encoding="utf-8", newline="")
+    try:
+        for inicio in range(0, max(len(data), 1), TAMANHO_LOTE):
+            lote = data.iloc[inicio:inicio + TAMANHO_LOTE]
+            if formato == "csv":
+                lote.to_csv(saida, header=inicio == 0, index=False)
+            elif len(lote):
+                saida.write(lote.to_json(orient="records", lines=True, force_ascii=False).rstrip("\n") + "\n")
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exporta as tabelas de indicadores do dashboard (por cidade ou consolidadas por microrregião)."
+    )
+    parser.add_argument("tabela", choices=["cidades", "microrregioes"])
+    parser.add_argument("--output", default="-", help="Arquivo .csv, .parquet ou .json (padrão: CSV na saída padrão)")
+    parser.add_argument("--format", choices=sorted(set(FORMATOS.values())), help="Formato, se diferente da extensão")
+    parser.add_argument("--file", default=INDICATOR_DATA_PATH, help="CSV de indicadores")
+    parser.add_argument("--anos", type=int, nargs=2, metavar=("INICIAL", "FINAL"), help="Anos (padrão: todos)")
+    parser.add_argument("--meses", type=int, nargs=2, metavar=("INICIAL", "FINAL"), help="Meses (padrão: todos)")
+    parser.add_argument("--anual", action="store_true", help="Apenas o consolidado anual")
+    parser.add_argument("--indicadores", nargs="+", help="Siglas dos indicadores (padrão: todas)")
+    parser.add_argument("--municipios", nargs="+", metavar="IBGE", help="Municípios, pelo IBGE (tabela de cidades)")
+    parser.add_argument("--microrregioes", nargs="+", help="Microrregiões (tabela de microrregiões)")
+    args = parser.parse_args()
+
+    data, versao_base, glossario = load_export_data(args.file)
+    anos = list(range(args.anos[0], args.anos[1] + 1)) if args.anos else None
+    meses = tuple(args.meses) if args.meses else None
+    if args.tabela == "cidades":
+        tabela = city_table(data, versao_base, glossario, args.indicadores, anos, meses, args.anual, args.municipios)
+    else:
+        tabela = microrregiao_table(data, versao_base, glossario, args.indicadores, anos, meses, args.anual, args.microrregioes)
+    write_table(tabela, args.output, args.format)
@@ -0,0 +1,370 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import geopandas as gpd
+import numpy as np
+import shapely
+from utils.cache import LRUCache
+
+# Tolerância de simplificação (em graus) para cada faixa de zoom do mapa.
+# Em zoom 8 um pixel equivale a ~600 m, então 0.002° (~220 m) não é perceptível.
+ZOOM_TOLERANCIAS = {
+    6: 0.01,
+    8: 0.002,
+    10: 0.0005,
+}
+
+# Casas decimais em que as coordenadas originais são quantizadas (1e-6° ≈ 0,1 m) para identificar os vértices
+# compartilhados entre municípios vizinhos
+PRECISAO_TOPOLOGIA = 6
+
+# Nome do objeto com os municípios no TopoJSON gerado
+OBJETO_TOPOJSON = "municipios"
+
+# Topologias (arcos) e regiões dissolvidas já calculadas, pelas geometrias de cada camada dos mapas
+_topologia_cache = LRUCache(16)
+_regioes_cache = LRUCache(16)
+
+def read_geometrias(file_path):
+    """
+    Lê o GeoJSON dos municípios do disco.
+    """
+    return gpd.read_file(file_path)
+
+def casas_decimais(tolerancia):
+    """
+    Casas decimais suficientes para uma tolerância de simplificação: o arredondamento desloca cada vértice em no
+    máximo metade da tolerância.
+    """
+    return max(0, math.ceil(-math.log10(tolerancia / 2)))
+
+def _poligonos(geometria):
+    """
+    Lista os polígonos de uma geometria (Polygon, MultiPolygon ou as partes poligonais de uma GeometryCollection).
+    """
+    if geometria.geom_type == "Polygon":
+        return [geometria]
+    return [poligono for parte in getattr(geometria, "geoms", []) for poligono in _poligonos(parte)]
+
+def _anel_quantizado(anel, escala):
+    """
+    Coordenadas inteiras de um anel, sem vértices repetidos em sequência e sem o ponto de fechamento.
+    """
+    pontos = np.round(np.asarray(anel.coords)[:, :2] * escala).astype(np.int64)
+    repetidos = np.r_[False, (pontos[1:] == pontos[:-1]).all(axis=1)]
+    pontos = pontos[~repetidos]
+    if len(pontos) > 1 and (pontos[0] == pontos[-1]).all():
+        pontos = pontos[:-1]
+    return pontos
+
+def build_topology(geometrias, precisao=PRECISAO_TOPOLOGIA):
+    """
+    Decompõe os anéis dos polígonos em arcos, como no TopoJSON: cada trecho de fronteira compartilhado por dois
+    municípios vira um único arco, referenciado pelos dois.
+
+    Os arcos são cortados nos vértices de junção, em que os anéis que passam pelo vértice deixam de seguir o mesmo
+    caminho. Anéis sem junções (ex: municípios encravados) viram um arco fechado, iniciado no menor vértice.
+
+    Args:
+        geometrias (iterable): Polígonos ou multipolígonos shapely.
+        precisao (int): Casas decimais da quantização das coordenadas.
+
+    Returns:
+        tuple: (arcos, objetos). `arcos` é uma lista de arrays inteiros (n, 2) em unidades de 10**-precisao graus;
+            `objetos` tem, para cada geometria, a lista de polígonos, cada um uma lista de anéis (exterior primeiro),
+            cada anel uma lista de índices de arcos (`~i` para o arco `i` percorrido em sentido inverso).
+    """
+    escala = 10 ** precisao
+    aneis = [
+        [[_anel_quantizado(anel, escala) for anel in [poligono.exterior, *poligono.interiors]] for poligono in _poligonos(geometria)]
+        for geometria in geometrias
+    ]
+
+    # Vizinhos (anterior e seguinte) de cada vértice em cada anel que passa por ele
+    vizinhos = {}
+    for poligonos in aneis:
+        for poligono in poligonos:
+            for pontos in poligono:
+                chaves = list(map(tuple, pontos.tolist()))
+                for i, ponto in enumerate(chaves):
+                    par = frozenset((chaves[i - 1], chaves[(i + 1) % len(chaves)]))
+                    vizinhos.setdefault(ponto, set()).add(par)
+    juncoes = {ponto for ponto, pares in vizinhos.items() if len(pares) > 1}
+
+    arcos, indice_arcos = [], {}
+
+    def referencia(arco):
+        chave = arco.tobytes()
+        if chave in indice_arcos:
+            return indice_arcos[chave]
+        inverso = arco[::-1].tobytes()
+        if inverso in indice_arcos:
+            return ~indice_arcos[inverso]
+        indice_arcos[chave] = len(arcos)
+        arcos.append(arco)
+        return len(arcos) - 1
+
+    objetos = []
+    for poligonos in aneis:
+        objeto = []
+        for poligono in poligonos:
+            refs_poligono = []
+            for pontos in poligono:
+                chaves = list(map(tuple, pontos.tolist()))
+                cortes = [i for i, ponto in enumerate(chaves) if ponto in juncoes]
+                if not cortes:
+                    # Arco fechado: começa no menor vértice, para que os dois lados da fronteira gerem o mesmo arco
+                    inicio = min(range(len(chaves)), key=chaves.__getitem__)
+                    fechado = np.roll(pontos, -inicio, axis=0)
+                    refs_poligono.append([referencia(np.vstack([fechado, fechado[:1]]))])
+                    continue
+                girado = np.roll(pontos, -cortes[0], axis=0)
+                cortes = [i - cortes[0] for i in cortes] + [len(pontos)]
+                girado = np.vstack([girado, girado[:1]])
+                refs_poligono.append([referencia(girado[a:b + 1]) for a, b in zip(cortes[:-1], cortes[1:])])
+            objeto.append(refs_poligono)
+        objetos.append(objeto)
+    return arcos, objetos
+
+def _pontos_do_anel(arcos, refs):
+    """
+    Concatena os arcos de um anel, na ordem e no sentido de cada referência.
+    """
+    partes = []
+    for ref in refs:
+        arco = arcos[ref] if ref >= 0 else arcos[~ref][::-1]
+        partes.append(arco if not partes else arco[1:])
+    return np.vstack(partes)
+
+def simplify_topology(arcos, objetos, tolerancia, precisao=PRECISAO_TOPOLOGIA, casas=None):
+    """
+    Simplifica cada arco uma única vez (Douglas-Peucker, mantendo as extremidades), de forma que as fronteiras
+    compartilhadas continuem idênticas dos dois lados, sem frestas ou sobreposições, e reduz as coordenadas a `casas`
+    casas decimais. Os arcos de anéis que degenerariam (menos de três vértices) são mantidos sem simplificação.
+
+    Returns:
+        list: Arcos simplificados, em unidades de 10**-casas graus.
+    """
+    casas = casas_decimais(tolerancia) if casas is None else casas
+    fator = 10 ** (precisao - casas)
+
+    def reduzir(arco):
+        pontos = np.round(arco / fator).astype(np.int64)
+        repetidos = np.r_[False, (pontos[1:] == pontos[:-1]).all(axis=1)]
+        return pontos[~repetidos]
+
+    simplificados = [
+        np.asarray(shapely.LineString(arco).simplify(tolerancia * 10 ** precisao, preserve_topology=False).coords)
+        if len(arco) > 2 else arco
+        for arco in arcos
+    ]
+    simplificados = [reduzir(arco) for arco in simplificados]
+    for objeto in objetos:
+        for poligono in objeto:
+            for refs in poligono:
+                if len(np.unique(_pontos_do_anel(simplificados, refs), axis=0)) < 3:
+                    for ref in refs:
+                        indice = ref if ref >= 0 else ~ref
+                        simplificados[indice] = reduzir(arcos[indice])
+    return simplificados
+
+def geometrias_da_topologia(arcos, objetos, casas):
+    """
+    Reconstrói os polígonos shapely a partir dos arcos (em unidades de 10**-casas graus).
+    """
+    geometrias = []
+    for objeto in objetos:
+        poligonos = []
+        for poligono in objeto:
+            aneis = [np.round(_pontos_do_anel(arcos, refs) / 10 ** casas, casas) for refs in poligono]
+            poligonos.append(shapely.Polygon(aneis[0], aneis[1:]))
+        geometria = poligonos[0] if len(poligonos) == 1 else shapely.MultiPolygon(poligonos)
+        geometrias.append(geometria if geometria.is_valid else shapely.make_valid(geometria))
+    return geometrias
+
+def simplificar_por_zoom(geojson, tolerancias=ZOOM_TOLERANCIAS):
+    """
+    Pré-calcula as geometrias simplificadas para cada faixa de zoom, preservando a topologia: as fronteiras
+    compartilhadas são simplificadas uma única vez e as coordenadas são arredondadas às casas decimais da faixa.
+
+    Args:
+        geojson (gpd.GeoDataFrame): Geometrias originais dos municípios.
+        tolerancias (dict): Dicionário mapeando a faixa de zoom para a tolerância de simplificação.
+
+    Returns:
+        dict: Dicionário mapeando a faixa de zoom para um GeoDataFrame com as geometrias simplificadas.
+    """
+    arcos, objetos = build_topology(geojson.geometry)
+    camadas = {}
+    for zoom, tolerancia in tolerancias.items():
+        casas = casas_decimais(tolerancia)
+        simplificados = simplify_topology(arcos, objetos, tolerancia, casas=casas)
+        camadas[zoom] = geojson.set_geometry(
+            gpd.GeoSeries(geometrias_da_topologia(simplificados, objetos, casas), index=geojson.index, crs=geojson.crs)
+        )
+    return camadas
+
+def _casas_das_coordenadas(geometrias, maximo=PRECISAO_TOPOLOGIA):
+    """
+    Menor número de casas decimais que representa exatamente as coordenadas (ex: as de `simplificar_por_zoom`).
+    """
+    coordenadas = shapely.get_coordinates(np.asarray(geometrias))
+    for casas in range(maximo + 1):
+        if np.allclose(np.round(coordenadas, casas), coordenadas, rtol=0, atol=1e-9):
+            return casas
+    return maximo
+
+def _chave_geometrias(geometrias):
+    """
+    Resumo do conteúdo das geometrias, usado como chave dos caches de topologia e de regiões.
+    """
+    return hashlib.sha1(b"".join(shapely.to_wkb(np.asarray(geometrias)))).hexdigest()
+
+def _topologia(geometrias, casas):
+    """
+    Retorna a topologia (ver `build_topology`) das geometrias, calculada uma única vez.
+    """
+    return _topologia_cache.get_or_set(
+        (_chave_geometrias(geometrias), casas), lambda: build_topology(geometrias, precisao=casas)
+    )
+
+def dissolve_regions(camada, regioes):
+    """
+    Une as geometrias dos municípios de cada região (ex: microrregião), calculando a união uma única vez por
+    conjunto de geometrias e registro de regiões. Como as fronteiras compartilhadas são idênticas dos dois lados
+    (ver `simplificar_por_zoom`), a união não deixa frestas no interior das regiões.
+
+    Args:
+        camada (gpd.GeoDataFrame): Geometrias dos municípios, com a coluna "id" (IBGE).
+        regioes (dict): Dicionário mapeando cada região para os IBGEs dos seus municípios.
+
+    Returns:
+        gpd.GeoDataFrame: Uma linha por região com municípios na camada, na ordem do registro, com a coluna "Região".
+    """
+    def dissolver():
+        ids = camada["id"].astype(str)
+        nomes, geometrias = [], []
+        for regiao, ibges in regioes.items():
+            membros = camada.geometry[ids.isin([str(ibge) for ibge in ibges]).to_numpy()]
+            if len(membros):
+                nomes.append(regiao)
+                geometrias.append(shapely.union_all(np.asarray(membros)))
+        return gpd.GeoDataFrame({"Região": nomes}, geometry=geometrias, crs=camada.crs)
+
+    chave = (_chave_geometrias(camada.geometry), tuple((regiao, tuple(ibges)) for regiao, ibges in regioes.items()))
+    return _regioes_cache.get_or_set(chave, dissolver)
+
+def internal_borders(camada, casas=None):
+    """
+    Retorna as fronteiras entre municípios vizinhos (arcos compartilhados por dois anéis), cada uma uma única vez,
+    sem o contorno externo da área.
+
+    Returns:
+        shapely.MultiLineString: Fronteiras internas, em graus.
+    """
+    casas = _casas_das_coordenadas(camada.geometry) if casas is None else casas
+    arcos, objetos = _topologia(camada.geometry, casas)
+    usos = np.zeros(len(arcos), dtype=int)
+    for objeto in objetos:
+        for poligono in objeto:
+            for refs in poligono:
+                for ref in refs:
+                    usos[ref if ref >= 0 else ~ref] += 1
+    return shapely.MultiLineString(
+        [np.round(arco / 10 ** casas, casas) for arco, uso in zip(arcos, usos) if uso > 1]
+    )
+
+def to_topojson(camada, casas=None):
+    """
+    Converte as geometrias e propriedades em TopoJSON: arcos compartilhados, coordenadas inteiras codificadas
+    como diferenças em relação ao vértice anterior (a partir do canto da área) e uma transformação para graus.
+    Os arcos de cada conjunto de geometrias são calculados uma única vez.
+
+    Args:
+        camada (gpd.GeoDataFrame): Geometrias (ex: uma faixa de `simplificar_por_zoom`) e propriedades.
+        casas (int, optional): Casas decimais das coordenadas; se None, as mínimas que as representam exatamente.
+
+    Returns:
+        dict: Topologia com os municípios no objeto `OBJETO_TOPOJSON`.
+    """
+    casas = _casas_das_coordenadas(camada.geometry) if casas is None else casas
+    arcos, objetos = _topologia(camada.geometry, casas)
+    origem = np.vstack([arco.min(axis=0) for arco in arcos]).min(axis=0) if arcos else np.zeros(2, dtype=np.int64)
+
+    propriedades = json.loads(camada.drop(columns=camada.geometry.name).to_json(orient="records", force_ascii=False))
+    geometrias = []
+    for objeto, props in zip(objetos, propriedades):
+        if len(objeto) == 1:
+            geometrias.append({"type": "Polygon", "arcs": objeto[0], "properties": props})
+        else:
+            geometrias.append({"type": "MultiPolygon", "arcs": objeto, "properties": props})
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": [10 ** -casas, 10 ** -casas], "translate": np.round(origem * 10.0 ** -casas, casas).tolist()},
+        "objects": {OBJETO_TOPOJSON: {"type": "GeometryCollection", "geometries": geometrias}},
+        "arcs": [np.vstack([arco[:1] - origem, np.diff(arco, axis=0)]).tolist() for arco in arcos],
+    }
+
+def build_spatial_index(camada):
+    """
+    Constrói o índice espacial (STRtree) das geometrias dos municípios, para localizar o município de um ponto.
+
+    Returns:
+        tuple: (árvore STRtree, array com o IBGE de cada geometria na ordem da árvore).
+    """
+    return shapely.STRtree(np.asarray(camada.geometry)), camada["id"].astype(str).to_numpy()
+
+def locate_municipio(indice, lat, lng):
+    """
+    Retorna o IBGE do município que contém o ponto (ex: o clique no mapa), ou None se o ponto estiver fora de todos.
+
+    Args:
+        indice (tuple): Retorno de `build_spatial_index`.
+        lat, lng (float): Coordenadas do ponto, em graus.
+    """
+    arvore, ids = indice
+    encontrados = arvore.query(shapely.Point(lng, lat), predicate="intersects")
+    return ids[encontrados.min()] if len(encontrados) else None
+
+def faixa_de_zoom(zoom, tolerancias=ZOOM_TOLERANCIAS):
+    """
+    Retorna a faixa pré-calculada mais detalhada que não ultrapassa o zoom informado.
+    """
+    faixas = sorted(tolerancias)
+    candidatas = [faixa for faixa in faixas if faixa <= zoom]
+    return candidatas[-1] if candidatas else faixas[0]
+
+def write_geometrias(file_path, pasta):
+    """
+    Grava, para cada faixa de zoom, as geometrias simplificadas em GeoJSON compacto e em TopoJSON.
+
+    Returns:
+        list: Caminhos dos arquivos gerados.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    nome = os.path.splitext(os.path.basename(file_path))[0]
+    gerados = []
+    for zoom, camada in simplificar_por_zoom(read_geometrias(file_path)).items():
+        caminho = os.path.join(pasta, f"{nome}-z{zoom}.geojson")
+        with open(caminho, "w", encoding="utf-8") as saida:
+            saida.write(camada.to_json(drop_id=True, separators=(",", ":"), ensure_ascii=False))
+        gerados.append(caminho)
+
+        caminho = os.path.join(pasta, f"{nome}-z{zoom}.topojson")
+        with open(caminho, "w", encoding="utf-8") as saida:
+            json.dump(to_topojson(camada), saida, separators=(",", ":"), ensure_ascii=False)
+        gerados.append(caminho)
+    return gerados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Gera as geometrias dos municípios simplificadas por faixa de zoom, em GeoJSON compacto e TopoJSON."
+    )
+    parser.add_argument("file_path", nargs="?", default="./data/geojs-25-mun.json")
+    parser.add_argument("--output-dir", default="./data/cache/geometrias")
+    args = parser.parse_args()
+    for caminho in write_geometrias(args.file_path, args.output_dir):
+        print(f"{os.path.getsize(caminho) / 1024:8.1f} KB  {caminho}")
@@ -0,0 +1,213 @@
+import argparse
+import glob
+import os
+import pandas as pd
+import pyarrow.feather as feather
+from utils.functions import clean_data
+from utils.schema import INDICATOR_SCHEMA, apply_indicator_schema
+
+# Versão do formato gravado em cache; incrementar sempre que a preparação dos dados mudar
+CACHE_VERSION = 2
+
+# Colunas do CSV de indicadores do SIRE, na ordem do arquivo
+COLUNAS_CSV = ["Sigla", "Valor", "Unidade", "Mês", "Ano", "Cidade", "IBGE"]
+
+# Chave de uma medição: município, indicador e período ("Mês_Num" é 0 no consolidado anual)
+CHAVE_MEDICAO = ["IBGE", "Sigla", "Ano", "Mês_Num"]
+
+def cache_dir(file_path):
+    """
+    Retorna o diretório de cache colunar ao lado do arquivo de origem.
+    """
+    return os.path.join(os.path.dirname(file_path), "cache")
+
+def source_fingerprint(file_path):
+    """
+    Identifica a versão do arquivo de origem pelo tamanho e pela data de modificação.
+    """
+    stat = os.stat(file_path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+def indicator_cache_path(file_path):
+    """
+    Retorna o caminho do arquivo Feather correspondente à versão atual do CSV de origem.
+    """
+    nome = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir(file_path), f"{nome}-{source_fingerprint(file_path)}-v{CACHE_VERSION}.feather")
+
+def prepare_indicator_data(file_path):
+    """
+    Lê o CSV de indicadores, aplica a limpeza usada pelo dashboard e converte para o esquema canônico.
+
+    Args:
+        file_path (str): Caminho do CSV de indicadores.
+
+    Returns:
+        pd.DataFrame: DataFrame limpo no esquema de `utils.schema.INDICATOR_SCHEMA`.
+    """
+    return prepare_indicator_rows(pd.read_csv(file_path, sep=','))
+
+def prepare_indicator_rows(data):
+    """
+    Aplica a limpeza usada pelo dashboard às linhas lidas de um CSV de indicadores e converte para o esquema canônico.
+    """
+    # Limpar dados
+    columns_to_check = ["IBGE", "Cidade", "Sigla", "Ano", "Valor"]  # Colunas críticas
+    data = clean_data(data, columns_to_check)
+
+    data["Ano"] = pd.to_numeric(data["Ano"].astype(str).str.replace(".", "", regex=False))
+    data["IBGE"] = data["IBGE"].astype(str)
+
+    # Converter a coluna "Valor" para numérico e descartar valores não numéricos
+    data["Valor"] = pd.to_numeric(data["Valor"], errors="coerce")
+    data = data.dropna(subset=["Valor"])
+
+    return apply_indicator_schema(data)
+
+def write_indicator_cache(data, cache_path):
+    """
+    Grava o DataFrame em Feather sem compressão (para permitir memory-map), de forma atômica. O nome temporário é
+    por processo, para que a ingestão pela linha de comando e o dashboard não gravem o mesmo arquivo ao mesmo tempo.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(data, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_indicator_cache(cache_path):
+    """
+    Lê o arquivo Feather do cache usando memory-map. As colunas numéricas sem valores ausentes apontam diretamente
+    para o arquivo mapeado (somente leitura), sem cópia.
+    """
+    return feather.read_table(cache_path, memory_map=True).to_pandas(split_blocks=True)
+
+def read_new_rows(novo_path):
+    """
+    Lê um CSV com novas linhas de indicadores (por exemplo, a extração de um novo mês) e valida as colunas.
+
+    Raises:
+        ValueError: Se faltar alguma coluna do CSV de indicadores.
+    """
+    novos = pd.read_csv(novo_path, sep=',')
+    faltando = [coluna for coluna in COLUNAS_CSV if coluna not in novos.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes em '{novo_path}': {', '.join(faltando)}.")
+    return prepare_indicator_rows(novos[COLUNAS_CSV])
+
+def new_measurements(data, novos):
+    """
+    Retorna as linhas de `novos` cuja chave (`CHAVE_MEDICAO`) ainda não existe em `data`, sem repetições.
+    Apenas as linhas novas são comparadas, contra o índice de chaves dos dados existentes.
+    """
+    novos = novos.drop_duplicates(subset=CHAVE_MEDICAO)
+    # O índice dos dados existentes usa as colunas já tipadas (as categorias viram os níveis do índice, sem
+    # conversão das linhas); apenas as chaves novas são convertidas para os mesmos tipos
+    existentes = pd.MultiIndex.from_frame(data[CHAVE_MEDICAO])
+    tipos = {
+        coluna: str if isinstance(tipo, pd.CategoricalDtype) else tipo
+        for coluna, tipo in data[CHAVE_MEDICAO].dtypes.items()
+    }
+    chaves_novas = pd.MultiIndex.from_frame(novos[CHAVE_MEDICAO].astype(tipos))
+    return novos[~chaves_novas.isin(existentes)].reset_index(drop=True)
+
+def to_source_rows(data):
+    """
+    Converte linhas no esquema canônico de volta para o formato do CSV de indicadores.
+    """
+    meses = data["Mês_Num"].astype("Int64")
+    return data.assign(Mês=meses.mask(meses == 0))[COLUNAS_CSV]
+
+def append_indicator_data(file_path, novo_path):
+    """
+    Acrescenta ao CSV de indicadores as medições de um novo CSV que ainda não existem, atualizando o cache colunar
+    sem reprocessar a base inteira.
+
+    Args:
+        file_path (str): Caminho do CSV de indicadores.
+        novo_path (str): Caminho do CSV com as novas linhas, nas mesmas colunas do CSV de indicadores.
+
+    Returns:
+        tuple: (DataFrame atualizado, DataFrame com as linhas acrescentadas), ambos no esquema canônico.
+            Como as linhas entram no final dos dados, o cubo de agregados da nova versão é atualizado apenas com
+            elas (ver `utils.query.indicator_cube`).
+    """
+    data = ingest_indicator_data(file_path)
+    aceitos = new_measurements(data, read_new_rows(novo_path))
+    if aceitos.empty:
+        return data, aceitos
+
+    # Acrescentar as linhas ao CSV de origem, garantindo que o arquivo termine com quebra de linha
+    with open(file_path, "rb+") as origem:
+        origem.seek(0, os.SEEK_END)
+        if origem.tell() > 0:
+            origem.seek(-1, os.SEEK_END)
+            if origem.read(1) != b"\n":
+                origem.write(b"\n")
+    to_source_rows(aceitos).to_csv(file_path, mode="a", header=False, index=False)
+
+    # Gravar o cache da nova versão do CSV a partir dos dados já preparados
+    data = pd.concat([data, aceitos], ignore_index=True).astype(INDICATOR_SCHEMA)
+    cache_path = indicator_cache_path(file_path)
+    write_indicator_cache(data, cache_path)
+    remove_stale_caches(file_path, cache_path)
+    return data, aceitos
+
+def remove_stale_caches(file_path, cache_path):
+    """
+    Remove os arquivos de cache de versões anteriores do mesmo CSV de origem.
+    """
+    nome = os.path.splitext(os.path.basename(file_path))[0]
+    for antigo in glob.glob(os.path.join(cache_dir(file_path), f"{nome}-*.feather")):
+        if antigo != cache_path:
+            os.remove(antigo)
+
+def ingest_indicator_data(file_path):
+    """
+    Retorna os dados dos indicadores a partir do cache colunar, gerando-o se o CSV de origem mudou.
+
+    Args:
+        file_path (str): Caminho do CSV de indicadores.
+
+    Returns:
+        pd.DataFrame: DataFrame limpo e tipado.
+    """
+    cache_path = indicator_cache_path(file_path)
+    if os.path.exists(cache_path):
+        return read_indicator_cache(cache_path)
+
+    data = prepare_indicator_data(file_path)
+    write_indicator_cache(data, cache_path)
+    remove_stale_caches(file_path, cache_path)
+    return data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o cache colunar dos indicadores a partir do CSV do SIRE.")
+    parser.add_argument("file_path", nargs="?", default="./data/sire_indicador_valor_grid.csv")
+    parser.add_argument("--append", metavar="CSV", help="CSV com novas linhas (ex: extração mensal) a acrescentar")
+    parser.add_argument("--no-prerender", action="store_true", help="Não pré-gerar os mapas e gráficos do dashboard")
+    parser.add_argument("--workers", type=int, help="Processos da pré-geração (padrão: um por núcleo)")
+    args = parser.parse_args()
+    if args.append:
+        _, aceitos = append_indicator_data(args.file_path, args.append)
+        print(f"{len(aceitos)} linhas acrescentadas")
+    else:
+        ingest_indicator_data(args.file_path)
+    print(indicator_cache_path(args.file_path))
+
+    # Mapas e gráficos pré-gerados são indexados pelo conteúdo dos dados: uma nova versão do CSV do dashboard
+    # deixa os anteriores sem uso, então eles são gerados novamente (importados aqui para evitar o ciclo de imports)
+    from utils.dashboard import INDICATOR_DATA_PATH
+    if os.path.realpath(args.file_path) != os.path.realpath(INDICATOR_DATA_PATH):
+        inexistente = "" if os.path.exists(INDICATOR_DATA_PATH) else " (arquivo inexistente)"
+        print(f"Mapas e gráficos não pré-gerados: o dashboard usa {INDICATOR_DATA_PATH}{inexistente}")
+    elif args.no_prerender:
+        print("Aviso: os mapas e gráficos pré-gerados podem estar desatualizados; execute `python -m components.prerender`")
+    else:
+        from components.prerender import prerender
+        gerados, segundos, workers = prerender(args.workers)
+        print(f"{len(gerados)} mapas e gráficos pré-gerados em {segundos:.1f} s com {workers} processo(s)")
@@ -0,0 +1,103 @@
+# Registro das microrregiões atendidas, mapeando cada microrregião para os IBGEs das suas cidades
+MICRORREGIOES = {
+    "ALTO PIRANHAS": [
+        "2500775", "2502003", "2502052", "2502201", "2502300", "2502409", 
+        "2502805", "2502904", "2503308", "2503704", "2504108", "2504306", 
+        "2507408", "2513653", "2508109", "2508406", "2509156", "2509370", 
+        "2509602", "2510006", "2510907", "2512036", "2512077", "2512804", 
+        "2513208", "2513307", "2513901", "2513968", "2513984", "2500700", 
+        "2514206", "2514503", "2514651", "2516201", "2516805", "2516904", 
+        "2517209", "2505501"
+        ],
+    "BORBOREMA": [
+        "2500304", "2500403", "2500536", "2500577", "2500734", "2500908",
+        "2501005", "2501203", "2501302", "2501351", "2501500", "2501534",
+        "2501575", "2501609", "2501708", "2502151", "2502508", "2503100",
+        "2503506", "2503555", "2503902", "2504009", "2504074", "2504157",
+        "2504355", "2504702", "2504850", "2505006", "2505105", "2505352",
+        "2505402", "2505709", "2506004", "2506103", "2506202", "2506251",
+        "2506509", "2507705", "2507804", "2508307", "2508505", "2509206",
+        "2509339", "2509396", "2509503", "2509701", "2509909", "2510105",
+        "2510303", "2510501", "2510600", "2510659", "2511103", "2511400",
+        "2512002", "2512200", "2512408", "2512507", "2512705", "2512747",
+        "2512754", "2512788", "2513158", "2513851", "2513943", "2514008",
+        "2514107", "2514800", "2515104", "2515203", "2515401", "2515500",
+        "2515807", "2515906", "2516003", "2516102", "2516151", "2516300",
+        "2516409", "2516508", "2516706", "2516755", "2517001", "2517407"
+        ],
+    "ESPINHARAS": [
+        "2500106", "2500205", "2501153", "2502102", "2503407", "2503753",
+        "2504207", "2504405", "2504504", "2504801", "2505303", "2505600",
+        "2505907", "2506608", "2502607", "2506707", "2507002", "2508000",
+        "2508703", "2508802", "2509008", "2510204", "2510402", "2510709",
+        "2510808", "2511004", "2511301", "2512101", "2512309", "2512606",
+        "2513000", "2513356", "2513406", "2513505", "2513604", "2513802",
+        "2513927", "2514305", "2514404", "2514552", "2514602", "2514701",
+        "2514909", "2515708", "2516607", "2517100", "2517100"
+    ],
+    "LITORAL": [
+        "2500502", "2500601", "2500809", "2501104", "2501401", "2501807",
+        "2501906", "2502706", "2503001", "2503209", "2503605", "2503803",
+        "2504033", "2504603", "2504900", "2505238", "2505204", "2505279",
+        "2505808", "2506301", "2506400", "2506806", "2506905", "2507101",
+        "2507200", "2507309", "2507507", "2507606", "2507903", "2508208",
+        "2508554", "2508604", "2508901", "2509057", "2509107", "2509305",
+        "2509404", "2509800", "2511202", "2512721", "2511509", "2511608",
+        "2511707", "2511806", "2511905", "2512762", "2512903", "2513109",
+        "2513703", "2514453", "2515005", "2515302", "2515609", "2515930",
+        "2515971"
+    ]
+}
+
+# Operação de agregação (ex: "mean", "sum") usada para consolidar cada indicador por microrregião
+OPERACOES = {
+    "IN200": "mean",
+    "IN201": "mean",
+    "IN202": "mean",
+    "IN203": "mean",
+    "IN204": "mean",
+    "IN205": "mean",
+    "IN206": "mean",
+    "IN207": "mean",
+    "IN208": "mean",
+    "IN209": "mean",
+    "IN210": "mean",
+    "IN211": "mean",
+    "IN212": "mean",
+    "IN213": "mean",
+    "IN214": "mean",
+    "IN215": "mean",
+}
+
+def build_ibge_index(microrregioes):
+    """
+    Constrói o índice reverso IBGE → microrregião.
+
+    Args:
+        microrregioes (dict): Dicionário mapeando as microrregiões para os IBGEs das cidades.
+
+    Returns:
+        dict: Dicionário mapeando o IBGE de cada cidade para a sua microrregião.
+    """
+    return {ibge: microrregiao for microrregiao, ibges in microrregioes.items() for ibge in ibges}
+
+# Índice reverso do registro, calculado uma única vez por processo
+IBGE_MICRORREGIAO = build_ibge_index(MICRORREGIOES)
+
+def get_ibge_index(microrregioes=MICRORREGIOES):
+    """
+    Retorna o índice reverso IBGE → microrregião, reaproveitando o índice pré-calculado do registro.
+    """
+    if microrregioes is MICRORREGIOES:
+        return IBGE_MICRORREGIAO
+    return build_ibge_index(microrregioes)
+
+def cidades_microrregioes(microrregioes_selecionadas, microrregioes=MICRORREGIOES):
+    """
+    Retorna os IBGEs (sem repetição) das cidades que pertencem às microrregiões selecionadas.
+    Se "Todas" estiver na seleção, retorna as cidades de todas as microrregiões.
+    """
+    indice = get_ibge_index(microrregioes)
+    if "Todas" in microrregioes_selecionadas:
+        return list(indice)
+    return [ibge for ibge, microrregiao in indice.items() if microrregiao in microrregioes_selecionadas]
@@ -0,0 +1,95 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+# Instrumentação opcional das etapas do dashboard (carga, filtros, agregação, mapas e gráficos).
+# Ativada com SIRE_PROFILE=1; desativada, as funções instrumentadas são chamadas diretamente.
+PROFILING = os.environ.get("SIRE_PROFILE") == "1"
+
+# Registros estruturados (JSON, um por etapa) para análise posterior
+# (gravados em SIRE_PROFILE_LOG, se informado, ou na saída de erro)
+logger = logging.getLogger("sire.profile")
+if PROFILING:
+    _handler = logging.FileHandler(os.environ["SIRE_PROFILE_LOG"]) if os.environ.get("SIRE_PROFILE_LOG") else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Cada sessão do Streamlit executa o script em sua própria thread, então as medições da execução atual são por thread
+_execucao = threading.local()
+
+def start_rerun(origem="página"):
+    """
+    Inicia as medições de uma nova execução do script (ou de um fragmento) e retorna seu identificador.
+    """
+    if PROFILING and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _execucao.id = uuid.uuid4().hex[:8]
+    _execucao.origem = origem
+    _execucao.registros = []
+    _execucao.profundidade = 0
+    return _execucao.id
+
+def rerun_records():
+    """
+    Retorna as medições da execução atual, na ordem em que as etapas começaram.
+    """
+    return list(getattr(_execucao, "registros", []))
+
+@contextmanager
+def measure(etapa):
+    """
+    Mede o tempo e a memória alocada por um trecho do dashboard, registrando o resultado na execução atual.
+    `memoria_mb` é a memória alocada que permanece ao fim do trecho e `pico_mb` o pico desde o início da etapa de
+    nível 0 que o contém. Sem SIRE_PROFILE=1, não faz nada.
+    """
+    if not PROFILING:
+        yield
+        return
+    if not hasattr(_execucao, "registros"):
+        start_rerun()
+
+    # O registro entra na lista no início do trecho, para que as etapas apareçam na ordem em que começaram
+    profundidade = _execucao.profundidade
+    registro = {"execucao": _execucao.id, "origem": _execucao.origem, "etapa": etapa, "nivel": profundidade}
+    _execucao.registros.append(registro)
+    _execucao.profundidade += 1
+    if profundidade == 0:
+        tracemalloc.reset_peak()
+    memoria_inicial, _ = tracemalloc.get_traced_memory()
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        memoria_final, pico = tracemalloc.get_traced_memory()
+        _execucao.profundidade = profundidade
+        registro.update({
+            "segundos": round(segundos, 6),
+            "memoria_mb": round((memoria_final - memoria_inicial) / 1024 / 1024, 3),
+            "pico_mb": round(pico / 1024 / 1024, 3),
+        })
+        logger.info(json.dumps(registro, ensure_ascii=False))
+
+def timed(etapa=None):
+    """
+    Decorador que mede cada chamada da função com `measure`, usando `etapa` (ou o nome da função) como rótulo.
+    """
+    def decorador(funcao):
+        nome = etapa or funcao.__name__
+
+        @functools.wraps(funcao)
+        def instrumentada(*args, **kwargs):
+            if not PROFILING:
+                return funcao(*args, **kwargs)
+            with measure(nome):
+                return funcao(*args, **kwargs)
+        return instrumentada
+    return decorador
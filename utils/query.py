@@ -0,0 +1,123 @@
+import threading
+import pandas as pd
+from utils.cache import LRUCache, data_fingerprint
+from utils.cube import build_indicator_cube, update_indicator_cube
+from utils.profiling import timed
+
+# Resultados das consultas compartilhados entre sessões, limitados às seleções usadas mais recentemente e pela
+# memória ocupada pelos DataFrames
+QUERY_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_query_cache = LRUCache(
+    max_entries=64, max_bytes=QUERY_CACHE_MAX_BYTES, sizeof=lambda df: int(df.memory_usage(deep=True).sum())
+)
+
+# Último cubo calculado, com o número de linhas e o resumo dos dados de origem, usado para atualizar o cubo da
+# versão seguinte quando os dados apenas ganharam linhas no final (ver `utils.ingest.append_indicator_data`)
+_ultimo_cubo = None
+_ultimo_cubo_lock = threading.Lock()
+
+def _como_chave(valores):
+    """
+    Normaliza uma seleção (lista de municípios, indicadores, anos...) para uso na chave do cache.
+    """
+    if valores is None:
+        return None
+    return frozenset(valores)
+
+def query_key(versao, ibges=None, cidades=None, siglas=None, anos=None, meses=None, anual=None):
+    """
+    Monta a chave de cache de uma consulta. Pode ser usada como `versao` de consultas encadeadas sobre o resultado.
+    """
+    return (
+        versao,
+        _como_chave(ibges),
+        _como_chave(cidades),
+        _como_chave(siglas),
+        _como_chave(anos),
+        tuple(meses) if meses is not None else None,
+        anual,
+    )
+
+def _apply_filters(data, ibges=None, cidades=None, siglas=None, anos=None, meses=None, anual=None):
+    """
+    Aplica os filtros informados em uma única máscara booleana.
+    """
+    mask = pd.Series(True, index=data.index)
+    if ibges is not None:
+        mask &= data["IBGE"].isin(ibges)
+    if cidades is not None:
+        mask &= data["Cidade"].isin(cidades)
+    if siglas is not None:
+        mask &= data["Sigla"].isin(siglas)
+    if anos is not None:
+        mask &= data["Ano"].isin(anos)
+    if meses is not None:
+        mes_inicial, mes_final = meses
+        mask &= (data["Mês_Num"] >= mes_inicial) & (data["Mês_Num"] <= mes_final)
+    if anual:
+        mask &= data["Mês_Num"] == 0
+    if mask.all():
+        # Nenhuma linha descartada: os próprios dados, sem cópia
+        return data
+    return data[mask]
+
+@timed()
+def filter_indicator_data(data, versao, glossario=None, **filtros):
+    """
+    Filtra os dados dos indicadores pela seleção do usuário, reaproveitando resultados de seleções já consultadas.
+    Os DataFrames retornados são compartilhados entre as sessões e não devem ser modificados.
+
+    Args:
+        data (pd.DataFrame): DataFrame com os dados dos indicadores.
+        versao (hashable): Identifica o conteúdo de `data` (e do glossário, se informado), por exemplo a versão do arquivo de origem.
+        glossario (pd.DataFrame, optional): Glossário cujo "Título" é mesclado pela Sigla antes de filtrar.
+        **filtros: ibges, cidades, siglas e anos (listas de valores aceitos), meses (tupla com o mês inicial e
+            final, excluindo o consolidado anual) e anual (True para manter apenas o consolidado anual).
+
+    Returns:
+        pd.DataFrame: DataFrame filtrado.
+    """
+    if glossario is not None:
+        dados_base = data
+        versao = ("glossario", versao)
+        data = _query_cache.get_or_set(
+            versao,
+            lambda: pd.merge(
+                dados_base,
+                glossario[["Sigla", "Título"]],  # Selecionar colunas úteis
+                on="Sigla",
+                how="left"
+            )
+        )
+
+    return _query_cache.get_or_set(query_key(versao, **filtros), lambda: _apply_filters(data, **filtros))
+
+@timed()
+def indicator_cube(data, versao):
+    """
+    Retorna o cubo de agregados (ver `utils.cube.build_indicator_cube`) dos dados, calculado uma única vez por versão.
+    O cubo é compartilhado entre as sessões e não deve ser modificado.
+    """
+    return _query_cache.get_or_set(("cubo", versao), lambda: _build_or_update_cube(data))
+
+def _build_or_update_cube(data):
+    """
+    Calcula o cubo dos dados. Se os dados começam com as mesmas linhas do último cubo calculado (novas medições
+    acrescentadas ao final), apenas as linhas novas são agregadas com `update_indicator_cube`; caso contrário, o cubo
+    é recalculado por completo.
+    """
+    global _ultimo_cubo
+    with _ultimo_cubo_lock:
+        anterior = _ultimo_cubo
+
+    cube = None
+    if anterior is not None:
+        linhas, resumo, cube_anterior = anterior
+        if linhas <= len(data) and data_fingerprint(data.iloc[:linhas]) == resumo:
+            cube = update_indicator_cube(cube_anterior, data.iloc[linhas:])
+    if cube is None:
+        cube = build_indicator_cube(data)
+
+    with _ultimo_cubo_lock:
+        _ultimo_cubo = (len(data), data_fingerprint(data), cube)
+    return cube
@@ -0,0 +1,46 @@
+import pandas as pd
+
+# Mapeamento de meses
+MESES = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril", 5: "Maio", 6: "Junho",
+    7: "Julho", 8: "Agosto", 9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
+}
+MESES_NUM = {nome: numero for numero, nome in MESES.items()}
+
+# Meses por extenso como categoria ordenada, de forma que ordenar por "Mês" já resulte na ordem cronológica
+MES_DTYPE = pd.CategoricalDtype(list(MESES.values()), ordered=True)
+
+# Esquema canônico das linhas de indicadores.
+# "Mês_Num" é 0 nas linhas de consolidado anual (sem mês definido), que têm "Mês" ausente.
+INDICATOR_SCHEMA = {
+    "Sigla": "category",
+    "Valor": "float64",
+    "Unidade": "category",
+    "Mês": MES_DTYPE,
+    "Mês_Num": "int8",
+    "Ano": "int16",
+    "Cidade": "category",
+    "IBGE": "category",
+}
+
+def apply_indicator_schema(data):
+    """
+    Converte o DataFrame de indicadores para o esquema canônico.
+
+    Args:
+        data (pd.DataFrame): DataFrame limpo, com "Mês" numérico (1 a 12, ausente no consolidado anual).
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas e os tipos de `INDICATOR_SCHEMA`.
+    """
+    data = data.assign(**{
+        "Mês_Num": data["Mês"].fillna(0),
+        "Mês": data["Mês"].map(MESES),
+    })
+    return data[list(INDICATOR_SCHEMA)].astype(INDICATOR_SCHEMA)
+
+def mes_num(meses):
+    """
+    Retorna o número do mês (1 a 12) para uma série de meses por extenso, ou 0 quando o mês não está definido.
+    """
+    return meses.map(MESES_NUM).astype("float64").fillna(0).astype("int8")